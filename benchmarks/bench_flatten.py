@@ -0,0 +1,60 @@
+"""``flatten_dict`` against the recursive flattener it replaced, on a feature flags
+like document with tens of thousands of keys.
+
+Run it with::
+
+    python benchmarks/bench_flatten.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from configclasses.helpers import normalize_field_name  # noqa: E402
+from configclasses.loaders import flatten_dict  # noqa: E402
+
+
+def recursive_flatten_dict(dict: Dict[str, str]) -> Dict[str, str]:
+    """The flattener used before ``iter_flat_items``."""
+    flat_dict = {}
+    for k, v in dict.items():
+        if isinstance(v, Dict):
+            inner_dict = {
+                f"{k}_{inner_key}": inner_value for inner_key, inner_value in v.items()
+            }
+            flat_dict.update(recursive_flatten_dict(inner_dict))
+            continue
+        flat_dict[normalize_field_name(k)] = str(v)
+    return flat_dict
+
+
+def make_document(depth: int, width: int, leaves: int):
+    if depth == 0:
+        return {f"flag_{i}": i % 2 == 0 for i in range(leaves)}
+    return {f"group_{i}": make_document(depth - 1, width, leaves) for i in range(width)}
+
+
+def main():
+    for depth, width, leaves in ((1, 100, 400), (3, 10, 40), (6, 4, 10)):
+        document = make_document(depth, width, leaves)
+        keys = len(flatten_dict(document))
+        assert flatten_dict(document) == recursive_flatten_dict(document)
+        results = {}
+        for name, flatten in (
+            ("recursive", recursive_flatten_dict),
+            ("iterative", flatten_dict),
+        ):
+            results[name] = min(timeit.repeat(lambda: flatten(document), number=5)) / 5
+        print(
+            f"depth={depth} keys={keys}: "
+            + ", ".join(
+                f"{name} {seconds * 1e3:.1f} ms" for name, seconds in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-call cost of ``from_environ`` on a 200 field, 4 level nested configclass.
+
+Run it with::
+
+    python benchmarks/bench_from_environ.py
+"""
+
+import os
+import sys
+import timeit
+from dataclasses import make_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from configclasses import configclass  # noqa: E402
+
+LEAVES = 200
+DEPTH = 4
+BRANCHING = 2
+
+
+def make_config(depth: int = DEPTH, branching: int = BRANCHING, leaves: int = LEAVES):
+    """Build a configclass tree with ``leaves`` int/float/bool/str fields spread
+    over ``depth`` levels of ``branching`` nested configclasses."""
+    classes = sum(branching**level for level in range(depth))
+    per_class, extra = divmod(leaves, classes)
+    leaf_types = (int, float, bool, str)
+    counter = iter(range(classes))
+
+    def build(level: int):
+        number = next(counter)
+        own = per_class + (extra if number == 0 else 0)
+        class_fields = [
+            (f"field_{i}", leaf_types[i % len(leaf_types)]) for i in range(own)
+        ]
+        if level < depth - 1:
+            class_fields += [
+                (f"section_{i}", build(level + 1)) for i in range(branching)
+            ]
+        return configclass(make_dataclass(f"Config{number}", class_fields))
+
+    return build(0)
+
+
+def fill_environ(cls, parent: str = ""):
+    for name, field_type in cls.__annotations__.items():
+        key = f"{parent}{name}".upper()
+        if isinstance(field_type, type) and hasattr(field_type, "from_environ"):
+            fill_environ(field_type, f"{key}_")
+        else:
+            os.environ[key] = {int: "1", float: "1.5", bool: "true", str: "x"}[
+                field_type
+            ]
+
+
+def main():
+    config_class = make_config()
+    fill_environ(config_class)
+    number = 2_000
+    best = min(timeit.repeat(config_class.from_environ, number=number, repeat=5))
+    print(
+        f"from_environ ({LEAVES} fields, {DEPTH} levels): "
+        f"{best / number * 1e6:.1f} us per call"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Per-call cost of ``from_environ`` as the environment grows, for a small class, a
+class with a ``Dict`` field (filled by a prefix scan) and a cached class with a
+``List`` field (whose cache key scans its prefix).
+
+Run it with::
+
+    python benchmarks/bench_large_environ.py
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from configclasses import configclass  # noqa: E402
+
+ENVIRON_SIZES = (0, 5_000, 10_000)
+
+
+@configclass(prefix="BENCH")
+class Small:
+    host: str = "localhost"
+    port: int = 80
+    debug: bool = False
+
+
+@configclass(prefix="BENCH")
+class WithMapping:
+    host: str = "localhost"
+    flags: Dict[str, bool] = None
+
+
+@configclass(prefix="BENCH", frozen=True, cache=True)
+class CachedWithList:
+    host: str = "localhost"
+    hosts: List[str] = None
+
+
+def per_call(function, number: int = 200) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    os.environ.update(
+        {"BENCH_HOST": "db", "BENCH_FLAGS_SEARCH": "true", "BENCH_HOSTS_0": "a"}
+    )
+    baseline = len(os.environ)
+    print(f"{'env vars':>10} {'small':>10} {'Dict field':>12} {'cached List':>12}")
+    for extra in ENVIRON_SIZES:
+        os.environ.update({f"FILLER_VARIABLE_{i}": str(i) for i in range(extra)})
+        timings = [
+            per_call(cls.from_environ) * 1e6
+            for cls in (Small, WithMapping, CachedWithList)
+        ]
+        print(
+            f"{baseline + extra:>10} {timings[0]:>8.1f} µs {timings[1]:>9.1f} µs"
+            f" {timings[2]:>9.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Cold start cost of loading a directory of YAML and TOML config files (2,000 keys)
+with ``parse_path`` against loading its compiled snapshot with ``load_snapshot``.
+
+Each load runs in a fresh interpreter and includes importing configclasses and the
+parsers it needs, as at process start.
+
+Run it with::
+
+    python benchmarks/bench_snapshot.py
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from configclasses.snapshot import compile_snapshot  # noqa: E402
+
+KEYS = 1_000
+RUNS = 10
+
+TIMED = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def write_configs(directory: Path):
+    lines = []
+    for i in range(KEYS):
+        if i % 50 == 0:
+            lines.append(f"section_{i // 50}:\n")
+        lines.append(f"  key_{i}: value {i}\n")
+    (directory / "base.yaml").write_text("".join(lines))
+    (directory / "override.toml").write_text(
+        "".join(f"other_{i} = {i}\n" for i in range(KEYS))
+    )
+
+
+def cold_seconds(statement: str) -> float:
+    code = TIMED.format(statement=statement)
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=REPO,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(RUNS)
+    ]
+    return min(timings)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        config_dir = Path(directory) / "config"
+        config_dir.mkdir()
+        write_configs(config_dir)
+        snapshot = Path(directory) / "config.snapshot"
+        compile_snapshot(config_dir, snapshot)
+
+        parse_seconds = cold_seconds(
+            "from pathlib import Path\n"
+            "from configclasses.configclasses import parse_path\n"
+            f"parse_path(Path({str(config_dir)!r}))"
+        )
+        snapshot_seconds = cold_seconds(
+            "from configclasses.snapshot import load_snapshot\n"
+            f"load_snapshot({str(snapshot)!r})"
+        )
+        unverified_seconds = cold_seconds(
+            "from configclasses.snapshot import load_snapshot\n"
+            f"load_snapshot({str(snapshot)!r}, verify=False)"
+        )
+
+    print(f"parse_path:                     {parse_seconds * 1000:.1f} ms")
+    print(f"load_snapshot:                  {snapshot_seconds * 1000:.1f} ms")
+    print(f"load_snapshot(verify=False):    {unverified_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
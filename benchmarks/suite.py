@@ -0,0 +1,150 @@
+"""Benchmark suite of the load, convert and dump paths of every file format.
+
+For each format and config size (number of fields and nesting depth) a config file is
+generated with the format's dumper and the suite measures:
+
+- ``parse``: seconds to parse and flatten the file (the parsed files cache is bypassed),
+- ``from_environ``: seconds to build and convert the configclass from the parsed values,
+- ``dump``: seconds to dump the instance back to a string,
+- ``peak``: bytes allocated at peak (tracemalloc) while parsing and building it.
+
+Run it with::
+
+    python benchmarks/suite.py --output results.json --baseline baseline.json
+
+Results are written as JSON. When ``--baseline`` is given they are compared against
+it and the exit status is 1 if any of them is more than ``--threshold`` (20% by
+default) worse. A missing baseline file is created from the current results.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from dataclasses import is_dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_from_environ import make_config  # noqa: E402
+
+from configclasses.formats import get_format  # noqa: E402
+
+FORMATS = (".env", ".toml", ".yaml", ".ini", ".json")
+# (fields, nesting depth)
+SIZES = ((10, 1), (200, 1), (1000, 1), (200, 4), (1000, 4))
+SAMPLE_VALUES = {int: 42, float: 1.5, bool: True, str: "value"}
+
+
+def make_instance(cls):
+    return cls(
+        **{
+            name: (
+                make_instance(field_type)
+                if is_dataclass(field_type)
+                else SAMPLE_VALUES[field_type]
+            )
+            for name, field_type in cls.__annotations__.items()
+        }
+    )
+
+
+def best_time(function: Callable, repeat: int = 5, min_time: float = 0.05) -> float:
+    """Best seconds per call of ``function`` over ``repeat`` runs of at least
+    ``min_time`` seconds each."""
+    number = 1
+    while timeit.timeit(function, number=number) < min_time:
+        number *= 2
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def peak_memory(function: Callable) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(directory: Path, selected: str = "") -> Iterator[Tuple[str, float]]:
+    for fields, depth in SIZES:
+        cls = make_config(depth=depth, leaves=fields)
+        instance = make_instance(cls)
+        for extension in FORMATS:
+            name = f"{extension[1:]}/{fields}x{depth}"
+            if selected not in name:
+                continue
+            backend = get_format(extension)
+            path = directory / f"{fields}x{depth}{extension}"
+            path.write_text(backend.dump(instance, None))
+            values = backend.load(path)
+            if cls.from_environ(environ=values) != instance:
+                raise AssertionError(f"{name} does not round trip")
+
+            yield f"{name}/parse", best_time(lambda: backend.load(path))
+            yield f"{name}/from_environ", best_time(
+                lambda: cls.from_environ(environ=values)
+            )
+            yield f"{name}/dump", best_time(lambda: backend.dump(instance, None))
+            yield f"{name}/peak", peak_memory(
+                lambda: cls.from_environ(environ=backend.load(path))
+            )
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> bool:
+    """Print every result against the baseline. Returns whether none regressed."""
+    passed = True
+    for name, value in results.items():
+        if name not in baseline:
+            print(f"{name:<32} {value:>12.6g}  (new)")
+            continue
+        ratio = value / baseline[name] if baseline[name] else 1.0
+        regressed = ratio > 1 + threshold
+        passed = passed and not regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<32} {value:>12.6g} {ratio:>7.2f}x{flag}")
+    return passed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against this file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument(
+        "--select", default="", help="only run benchmarks whose name contains this"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = dict(run(Path(directory), args.select))
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline is None:
+        return 0 if compare(results, {}, args.threshold) else 1
+    if not args.baseline.exists():
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    baseline = json.loads(args.baseline.read_text())["results"]
+    return 0 if compare(results, baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,27 @@
-from configclasses.configclasses import configclass
+# Public names are imported on first access (PEP 562), so importing a submodule
+# like configclasses.loaders does not pay for the rest of the package.
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from configclasses.batch import load_many
+    from configclasses.configclasses import configclass
+    from configclasses.rebuild import rebuild
+
+__all__ = ["configclass", "load_many", "rebuild"]
+
+
+def __getattr__(name):
+    if name == "configclass":
+        from configclasses.configclasses import configclass as value
+    elif name == "load_many":
+        from configclasses.batch import load_many as value
+    elif name == "rebuild":
+        from configclasses.rebuild import rebuild as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
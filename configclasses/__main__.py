@@ -0,0 +1,72 @@
+"""Command line tools of configclasses.
+
+Compile the config files of a path into a snapshot loaded with ``from_snapshot``::
+
+    python -m configclasses compile config/ -o config.snapshot
+"""
+
+import argparse
+import sys
+
+
+def compile_command(args) -> int:
+    from configclasses.exceptions import (
+        ConfigFilePathDoesNotExist,
+        DependencyNotInstalled,
+        NonSupportedExtension,
+        ValidationError,
+    )
+    from configclasses.snapshot import compile_snapshot
+
+    try:
+        changed = compile_snapshot(
+            args.config_path, args.output, args.order, args.pattern, args.exclude
+        )
+    except (
+        ConfigFilePathDoesNotExist,
+        DependencyNotInstalled,
+        NonSupportedExtension,
+        ValidationError,
+    ) as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"{'Wrote' if changed else 'Unchanged'} {args.output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m configclasses", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser(
+        "compile", help="compile a config file or directory into a snapshot"
+    )
+    compile_parser.add_argument("config_path", help="config file or directory")
+    compile_parser.add_argument(
+        "-o", "--output", required=True, help="snapshot file to write"
+    )
+    compile_parser.add_argument(
+        "--order",
+        action="append",
+        default=[],
+        help="glob of files taking precedence, can be repeated",
+    )
+    compile_parser.add_argument(
+        "--pattern", default="**/*", help="glob of the config files of a directory"
+    )
+    compile_parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="glob of files to skip, can be repeated",
+    )
+    compile_parser.set_defaults(handler=compile_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from configclasses.configclasses import (
+    _from_values,
+    list_config_files,
+    merge_values,
+    parse_file,
+)
+
+
+async def parse_path_async(
+    path: Path,
+    executor: Optional[Executor] = None,
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+    max_workers: Optional[int] = None,
+) -> Mapping[str, str]:
+    """Same as ``parse_path`` without blocking the event loop: files are read and
+    parsed concurrently in ``executor`` and merged in the same order ``parse_path``
+    uses. Without an ``executor``, a pool of ``max_workers`` threads is used if
+    given, else the loop's default executor."""
+    if executor is None and max_workers is not None:
+        with ThreadPoolExecutor(
+            max_workers, thread_name_prefix="configclasses"
+        ) as pool:
+            return await parse_path_async(path, pool, order, pattern, exclude)
+    loop = asyncio.get_running_loop()
+    files = await loop.run_in_executor(
+        executor, list_config_files, path, order, pattern, exclude
+    )
+    if files == [path]:
+        return await loop.run_in_executor(executor, parse_file, path)
+    values = await asyncio.gather(
+        *(loop.run_in_executor(executor, parse_file, file) for file in files)
+    )
+    return merge_values(values)
+
+
+async def parse_string_async(
+    string: str, extension: str, executor: Optional[Executor] = None
+) -> Mapping[str, str]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(parse_file, string=string, extension=extension)
+    )
+
+
+async def from_path_async(
+    cls,
+    config_path: str,
+    defaults: Dict[str, str] = None,
+    export: bool = False,
+    executor: Optional[Executor] = None,
+    **path_options: Any,
+):
+    values = await parse_path_async(Path(config_path), executor, **path_options)
+    return _from_values(cls, values, defaults, export)
+
+
+async def from_string_async(
+    cls,
+    string: str,
+    extension: str,
+    defaults: Dict[str, str] = None,
+    export: bool = False,
+    executor: Optional[Executor] = None,
+):
+    values = await parse_string_async(string, extension, executor)
+    return _from_values(cls, values, defaults, export)
@@ -0,0 +1,54 @@
+import os
+from collections import ChainMap
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from configclasses.configclasses import parse_path
+from configclasses.helpers import index_mapping
+from configclasses.plan import execute_plan
+from configclasses.sources import Source
+
+LoadRequest = Union[type, Tuple[type, Mapping[str, Any]]]
+
+_request_options = {"prefix", "defaults"}
+
+
+def load_many(
+    requests: Iterable[LoadRequest],
+    sources: Sequence[Union[str, os.PathLike]] = (),
+    environ: Optional[Mapping[str, str]] = None,
+    max_workers: Optional[int] = None,
+) -> List[Any]:
+    """Build many configclass instances in one pass over the same sources.
+
+    Each request is a configclass or a ``(configclass, options)`` tuple, where
+    options may have a ``prefix`` replacing the one of the class and a ``defaults``
+    dict, e.g. one request per tenant::
+
+        load_many([(AppConfig, {"prefix": tenant}) for tenant in tenants], ["conf/"])
+
+    ``sources`` (config files or directories, later ones taking precedence) are
+    parsed once and indexed together with ``environ`` (``os.environ`` by default)
+    a single time, then every instance is built against that index, optionally
+    in a pool of ``max_workers`` threads. Instances are returned in request order.
+    """
+    layers = [parse_path(Path(source)) for source in reversed(sources)]
+    index = Source(*layers, os.environ if environ is None else environ).index()
+
+    def materialize(request: LoadRequest):
+        cls, options = request if isinstance(request, tuple) else (request, {})
+        unknown_options = set(options) - _request_options
+        if unknown_options:
+            raise TypeError(f"Unknown load_many options: {sorted(unknown_options)}")
+        plan = cls.__configclass_plan__(cls, None, options.get("prefix"))
+        defaults = options.get("defaults")
+        return execute_plan(
+            plan, ChainMap(index, index_mapping(defaults)) if defaults else index
+        )
+
+    if max_workers is None or max_workers < 2:
+        return [materialize(request) for request in requests]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="configclasses") as pool:
+        return list(pool.map(materialize, requests))
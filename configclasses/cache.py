@@ -0,0 +1,204 @@
+import os
+import threading
+from collections import OrderedDict
+from operator import attrgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+from weakref import WeakValueDictionary
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class FileCache:
+    """LRU cache of parsed and flattened config files.
+
+    Entries are keyed by resolved path and only reused while the file keeps the
+    same ``st_mtime_ns`` and ``st_size``, so a hit costs a single ``stat()``.
+    ``max_bytes`` bounds the total size of the cached files on disk.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, path: Path, parse: Callable[[Path], Dict[str, str]]
+    ) -> Mapping[str, str]:
+        """Parsed values of ``path``, calling ``parse(path)`` only on a miss."""
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        values = self._hit(key, stamp)
+        if values is not None:
+            return values
+        with self._lock:
+            self.misses += 1
+
+        values = MappingProxyType(parse(path))
+        with self._lock:
+            self._remove(key)
+            if self.max_entries > 0 and stat.st_size <= self.max_bytes:
+                self._entries[key] = (stamp, values)
+                self._bytes += stat.st_size
+                self._evict()
+        return values
+
+    def lookup(self, path: Path) -> Optional[Mapping[str, str]]:
+        """Parsed values of ``path`` if they are cached and the file did not change,
+        else ``None`` (not counted as a miss: ``get`` will parse it)."""
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        return self._hit(key, (stat.st_mtime_ns, stat.st_size))
+
+    def _hit(self, key: str, stamp: tuple) -> Optional[Mapping[str, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def invalidate(self, path: Optional[Union[str, os.PathLike]] = None):
+        """Drop ``path`` from the cache, or every entry if no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._remove(os.path.realpath(path))
+
+    def configure(
+        self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+    ):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                len(self._entries),
+                self._bytes,
+                self.max_entries,
+                self.max_bytes,
+            )
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0][1]
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, ((_, size), _) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+
+file_cache = FileCache()
+
+
+class InstanceCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class InstanceCache:
+    """Bounded LRU of configclass instances keyed by a fingerprint of their sources."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._instances: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, create: Callable[[], object]):
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+                return instance
+            self.misses += 1
+        instance = create()
+        with self._lock:
+            self._instances[key] = instance
+            while len(self._instances) > self.maxsize:
+                self._instances.popitem(last=False)
+        return instance
+
+    def cache_info(self) -> InstanceCacheInfo:
+        with self._lock:
+            return InstanceCacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._instances)
+            )
+
+    def cache_clear(self):
+        with self._lock:
+            self._instances.clear()
+            self.hits = self.misses = 0
+
+
+class InstancePool:
+    """Canonical instances of a frozen configclass (hash-consing): an instance equal
+    to one already in the pool is replaced by it, so configs sharing a sub-config
+    share a single object. The pool holds weak references when the class allows
+    them, so unused instances are not kept alive.
+
+    Instances are keyed by the tuple of their ``field_names`` values rather than
+    by themselves, which would keep them alive as keys.
+    """
+
+    def __init__(self, field_names: Sequence[str], weak: bool = True):
+        self._key = attrgetter(*field_names) if field_names else lambda _: ()
+        self._instances: "Mapping[object, object]" = (
+            WeakValueDictionary() if weak else {}
+        )
+        self._lock = threading.Lock()
+
+    def intern(self, instance):
+        try:
+            key = self._key(instance)
+            with self._lock:
+                return self._instances.setdefault(key, instance)
+        except TypeError:  # unhashable field values, e.g. lists
+            return instance
+
+    def __len__(self):
+        return len(self._instances)
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
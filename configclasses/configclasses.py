@@ -1,13 +1,65 @@
-import inspect
+import os
 from dataclasses import _process_class, fields
 from os import PathLike
 from pathlib import Path
-from typing import Dict, Optional
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
-from configclasses.dumpers import dump_env, dump_ini, dump_json, dump_toml, dump_yaml
-from configclasses.exceptions import ConfigFilePathDoesNotExist, NonSupportedExtension
-from configclasses.helpers import fill_init_dict, supported_extensions
-from configclasses.loaders import load_env, load_ini, load_json, load_toml, load_yaml
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from configclasses.watch import ConfigHolder
+
+from configclasses.cache import (
+    InstanceCache,
+    InstanceCacheInfo,
+    InstancePool,
+    file_cache,
+)
+from configclasses.exceptions import ConfigFilePathDoesNotExist
+from configclasses.formats import get_format, is_supported
+from configclasses.helpers import (
+    encode_environ_keys,
+    environ_fingerprint,
+    environ_scan,
+)
+from configclasses.instrumentation import (
+    LoadEvent,
+    emit,
+    hooks,
+    instrumented_get,
+    instrumented_load,
+)
+from configclasses.plan import (
+    LoadPlan,
+    compile_plan,
+    execute_plan,
+    iter_plan_keys,
+    iter_plan_prefixes,
+)
+from configclasses.provenance import recording
+from configclasses.sources import Source, build_index
+
+# Parameters of dataclasses' _process_class, which gained match_args, kw_only and
+# slots in Python 3.10 and weakref_slot in 3.11. Read from its code object once
+# instead of calling inspect.signature on every decoration.
+_process_class_parameters = frozenset(
+    _process_class.__code__.co_varnames[
+        : _process_class.__code__.co_argcount
+        + _process_class.__code__.co_kwonlyargcount
+    ]
+)
 
 
 def configclass(
@@ -25,25 +77,50 @@ def configclass(
     kw_only=False,
     slots=False,
     weakref_slot=False,
+    cache=False,
+    cache_size=128,
+    compact=False,
 ):
     """Same behaviour that dataclass with additional classmethods as dataclass initializers:
-    from_environ and from_path"""
+    from_environ and from_path
+
+    With ``cache=True`` (only for frozen configclasses), ``from_environ()`` returns the
+    same instance while the env vars the class reads and ``defaults`` don't change,
+    keeping up to ``cache_size`` instances. Only upper-case and lower-case spellings
+    of env var names are tracked; list and mapping fields are tracked by scanning
+    the env vars under their prefix.
+
+    ``compact=True`` trades a little load time for memory when holding many
+    instances: the class gets ``__slots__`` (Python 3.10+), ``str`` values are
+    interned and, for frozen classes, equal instances loaded as nested sub-configs
+    are deduplicated, so e.g. tenants with the same ``DB`` sub-config share it."""
+    if cache and not frozen:
+        raise ValueError("cache=True requires frozen=True")
 
     def wrap(cls):
-        signature = inspect.signature(_process_class)
         kwargs = {}
-        if "match_args" in signature.parameters:
+        if "match_args" in _process_class_parameters:
             kwargs["match_args"] = match_args
-        if "kw_only" in signature.parameters:
+        if "kw_only" in _process_class_parameters:
             kwargs["kw_only"] = kw_only
-        if "slots" in signature.parameters:
-            kwargs["slots"] = slots
-        if "weakref_slot" in signature.parameters:
-            kwargs["weakref_slot"] = weakref_slot
+        if "slots" in _process_class_parameters:
+            kwargs["slots"] = slots or compact
+        if "weakref_slot" in _process_class_parameters:
+            # Lets the pool of a compact class hold weak references.
+            kwargs["weakref_slot"] = weakref_slot or (compact and frozen)
 
+        the_class = _process_class(
+            cls, init, repr, eq, order, unsafe_hash, frozen, **kwargs
+        )
+        if compact:
+            the_class.__configclass_compact__ = True
+            if frozen:
+                the_class.__configclass_pool__ = InstancePool(
+                    [field.name for field in fields(the_class)],
+                    weak=hasattr(the_class, "__weakref__"),
+                )
         return _post_process_class(
-            _process_class(cls, init, repr, eq, order, unsafe_hash, frozen, **kwargs),
-            prefix,
+            the_class, prefix, InstanceCache(cache_size) if cache else None
         )
 
     # See if we're being called as @configclass or @configclass().
@@ -55,63 +132,381 @@ def configclass(
     return wrap(cls)
 
 
-def _post_process_class(the_class, the_prefix: Optional[str]):
+def _post_process_class(
+    the_class, the_prefix: Optional[str], instance_cache: Optional[InstanceCache] = None
+):
+    # Load plans are compiled once per (class, parent field name, prefix): the one
+    # used by from_environ() without a parent is built right now, at decoration time,
+    # unless its annotations reference names that are not defined yet.
+    plans = {}
+    try:
+        plans[(the_class, None, the_prefix)] = compile_plan(the_class, the_prefix)
+    except NameError:
+        pass
+
+    def get_plan(
+        cls, parent_field_name: Optional[str] = None, prefix: Optional[str] = None
+    ) -> LoadPlan:
+        prefix = the_prefix if prefix is None else prefix
+        plan = plans.get((cls, parent_field_name, prefix))
+        if plan is None:
+            plan = plans[(cls, parent_field_name, prefix)] = compile_plan(
+                cls, prefix, parent_field_name
+            )
+        return plan
+
     def from_environ(
-        cls, defaults: Dict[str, str] = None, parent_field_name: Optional[str] = None
+        cls,
+        defaults: Dict[str, str] = None,
+        parent_field_name: Optional[str] = None,
+        environ: Optional[Union[Mapping[str, str], Source]] = None,
+        prefix: Optional[str] = None,
+    ):
+        """Fill the configclass from ``environ`` (``os.environ`` if not given),
+        falling back to ``defaults``. A given ``environ`` is indexed once per call,
+        ``os.environ`` is only probed for the keys of the fields.
+
+        ``prefix`` replaces the one given to the decorator."""
+        plan = get_plan(cls, parent_field_name, prefix)
+        recorder = recording.get()
+        if recorder is not None:
+            return recorder.build(plan, environ, defaults)
+        if (
+            instance_cache is not None
+            and environ is None
+            and parent_field_name is None
+            and prefix is None
+            and cls is the_class
+        ):
+            try:
+                probe_keys, probe_prefixes = get_probe_keys(plan)
+                key = (
+                    environ_fingerprint(probe_keys),
+                    environ_scan(probe_prefixes) if probe_prefixes else None,
+                    frozenset(defaults.items()) if defaults else None,
+                )
+            except TypeError:  # unhashable defaults
+                pass
+            else:
+                return instance_cache.get_or_create(
+                    key, lambda: _load_plan(plan, None, defaults)
+                )
+        return _load_plan(plan, environ, defaults)
+
+    probe_keys = []
+
+    def get_probe_keys(plan):
+        if not probe_keys:
+            keys = iter_plan_keys(plan)
+            probe_keys.append(
+                (
+                    encode_environ_keys(
+                        spelling for key in keys for spelling in (key.upper(), key)
+                    ),
+                    tuple(iter_plan_prefixes(plan)),
+                )
+            )
+        return probe_keys[0]
+
+    def cache_info(cls) -> InstanceCacheInfo:
+        return instance_cache.cache_info()
+
+    def cache_clear(cls):
+        instance_cache.cache_clear()
+
+    def from_path(
+        cls,
+        config_path: str,
+        defaults: Dict[str, str] = None,
+        export: bool = False,
+        **path_options: Any,
+    ):
+        """Fill the configclass from the config files found in ``config_path``, then
+        from env vars and ``defaults``. Files are only written into ``os.environ``
+        if ``export`` is True.
+
+        ``path_options`` (``order``, ``pattern``, ``exclude``, ``max_workers``) tell
+        how a directory is walked, see ``parse_path``."""
+        start = perf_counter() if hooks else None
+        if not export and recording.get() is not None:
+            instance = _from_files(cls, Path(config_path), defaults, **path_options)
+        else:
+            values = parse_path(Path(config_path), **path_options)
+            instance = _from_values(cls, values, defaults, export, str(config_path))
+        if start is not None:
+            emit(LoadEvent("load", perf_counter() - start, cls, str(config_path)))
+        return instance
+
+    def from_string(
+        cls,
+        string: str,
+        extension: str,
+        defaults: Dict[str, str] = None,
+        export: bool = False,
     ):
-        fields_tuple = [
-            (field.name, field.type, field.default) for field in fields(cls)
-        ]
-        init_dict = fill_init_dict(
-            fields_tuple, defaults, parent_field_name, the_prefix
+        start = perf_counter() if hooks else None
+        values = parse_file(string=string, extension=extension)
+        instance = _from_values(cls, values, defaults, export, f"<string{extension}>")
+        if start is not None:
+            emit(LoadEvent("load", perf_counter() - start, cls))
+        return instance
+
+    def from_snapshot(
+        cls,
+        snapshot_path: str,
+        defaults: Dict[str, str] = None,
+        export: bool = False,
+        verify: bool = True,
+        **path_options: Any,
+    ):
+        """Fill the configclass from a snapshot built with ``compile_snapshot`` (or
+        ``python -m configclasses compile``), then from env vars and ``defaults``.
+
+        The snapshot is memory-mapped and needs no file format parser. If ``verify``
+        is True and its config files changed since it was compiled, they are loaded
+        instead; ``path_options`` must then be the ones it was compiled with."""
+        from configclasses.snapshot import load_snapshot
+
+        start = perf_counter() if hooks else None
+        values = load_snapshot(snapshot_path, verify, **path_options)
+        instance = _from_values(cls, values, defaults, export, str(snapshot_path))
+        if start is not None:
+            emit(LoadEvent("load", perf_counter() - start, cls, str(snapshot_path)))
+        return instance
+
+    def from_path_async(
+        cls,
+        config_path: str,
+        defaults: Dict[str, str] = None,
+        export: bool = False,
+        executor: Optional["Executor"] = None,
+        **path_options: Any,
+    ):
+        """Awaitable version of ``from_path`` that reads and parses the config files
+        concurrently in ``executor`` instead of blocking the event loop."""
+        from configclasses.aio import from_path_async
+
+        return from_path_async(
+            cls, config_path, defaults, export, executor, **path_options
         )
-        return cls(**init_dict)
 
-    def from_path(cls, config_path: str, defaults: Dict[str, str] = None):
-        path_to_env(Path(config_path))
-        return cls.from_environ(defaults)
+    def from_string_async(
+        cls,
+        string: str,
+        extension: str,
+        defaults: Dict[str, str] = None,
+        export: bool = False,
+        executor: Optional["Executor"] = None,
+    ):
+        from configclasses.aio import from_string_async
 
-    def from_string(cls, string: str, extension: str, defaults: Dict[str, str] = None):
-        load_file(string=string, extension=extension)
-        return cls.from_environ(defaults)
+        return from_string_async(cls, string, extension, defaults, export, executor)
 
+    def watch(
+        cls,
+        config_path: str,
+        defaults: Dict[str, str] = None,
+        interval: float = 1.0,
+        debounce: float = 0.2,
+        on_change: Optional[Callable] = None,
+        **path_options: Any,
+    ) -> "ConfigHolder":
+        """Load the configclass from ``config_path`` and keep reloading it into the
+        returned holder whenever the files change."""
+        from configclasses.watch import ConfigWatcher
+
+        watcher = ConfigWatcher(
+            cls, config_path, defaults, interval, debounce, path_options
+        )
+        if on_change:
+            watcher.holder.subscribe(on_change)
+        return watcher.start()
+
+    the_class.__configclass_plan__ = get_plan
     the_class.from_environ = classmethod(from_environ)
     the_class.from_path = classmethod(from_path)
     the_class.from_string = classmethod(from_string)
+    the_class.from_snapshot = classmethod(from_snapshot)
+    the_class.from_path_async = classmethod(from_path_async)
+    the_class.from_string_async = classmethod(from_string_async)
+    the_class.watch = classmethod(watch)
+    if instance_cache is not None:
+        the_class.cache_info = classmethod(cache_info)
+        the_class.cache_clear = classmethod(cache_clear)
 
     return the_class
 
 
-def path_to_env(path: Path):
-    """Given a path it loads into os.environ all config files found in this path."""
+def _load_plan(plan: LoadPlan, environ, defaults):
+    if hooks:
+        return instrumented_load(plan, environ, defaults)
+    return execute_plan(plan, build_index(environ, defaults))
+
+
+def _from_values(
+    cls,
+    values: Mapping[str, str],
+    defaults,
+    export: bool,
+    name: Optional[str] = None,
+):
+    if export:
+        os.environ.update(values)
+        return cls.from_environ(defaults)
+    # Same precedence as with export: upper-case env vars beat lower-case file keys,
+    # files override env vars spelled the same (see Source).
+    return cls.from_environ(
+        defaults, environ=Source(values, os.environ, names=(name, None))
+    )
+
+
+def _from_files(
+    cls,
+    path: Path,
+    defaults,
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+    max_workers: Optional[int] = None,
+):
+    # Same as from_path, with one layer per file so every value is traced back to
+    # the file it was read from.
+    files = list_config_files(path, order, pattern, exclude)[::-1]
+    source = Source(*map(parse_file, files), os.environ, names=(*map(str, files), None))
+    return cls.from_environ(defaults, environ=source)
+
+
+def parse_path(
+    path: Path,
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+    max_workers: Optional[int] = None,
+) -> Mapping[str, str]:
+    """Given a path it returns the flattened values of all config files found in it.
+
+    Files of a directory are merged in the precedence order of
+    ``list_config_files``. Files served by the parsed files cache are read
+    serially; only when several files have to be parsed are they parsed in a
+    thread pool.
+    """
+    files = list_config_files(path, order, pattern, exclude)
+    if files == [path]:
+        return parse_file(path)
+    cached = [cached_file(file) for file in files]
+    misses = [file for file, values in zip(files, cached) if values is None]
+    if len(misses) < 2 or max_workers == 1:
+        parsed = {file: parse_file(file) for file in misses}
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(
+            max_workers, thread_name_prefix="configclasses"
+        ) as pool:
+            parsed = dict(zip(misses, pool.map(parse_file, misses)))
+    return merge_values(
+        parsed[file] if values is None else values
+        for file, values in zip(files, cached)
+    )
+
+
+def list_config_files(
+    path: Path,
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+) -> List[Path]:
+    """``path`` itself if it is a file, or the config files under it matching the
+    ``pattern`` glob from lowest to highest precedence.
+
+    Files whose path relative to ``path`` matches one of the ``order`` globs take
+    precedence over the others, in the order the globs are given. Files are sorted
+    by relative path within the same precedence. Files with a non supported
+    extension or matching one of the ``exclude`` globs are skipped.
+    """
     if not path.exists():
         raise ConfigFilePathDoesNotExist(
             f"Config file path '{str(path)}' does not exist"
         )
     if path.is_file():
-        load_file(path)
-    else:
-        load_path(path)
+        return [path]
+
+    ranked_files = []
+    for file in path.glob(pattern):
+        relative_path = file.relative_to(path)
+        if not is_supported(get_extension(file)) or any(
+            relative_path.match(excluded) for excluded in exclude
+        ):
+            continue
+        if not file.is_file():
+            continue
+        rank = next(
+            (rank for rank, glob in enumerate(order, 1) if relative_path.match(glob)), 0
+        )
+        ranked_files.append((rank, relative_path.as_posix(), file))
+    return [file for *_, file in sorted(ranked_files)]
+
+
+def merge_values(values: Iterable[Mapping[str, str]]) -> Dict[str, str]:
+    merged = {}
+    for file_values in values:
+        merged.update(file_values)
+    return merged
+
+
+def get_extension(path: Path) -> str:
+    return path.suffix or path.name
+
+
+def parse_file(
+    path: Optional[Path] = None,
+    string: Optional[str] = None,
+    extension: Optional[str] = None,
+) -> Mapping[str, str]:
+    backend = get_format(get_extension(path) if path else extension)
+    if path:
+        if hooks:
+            return instrumented_get(file_cache, path, backend)
+        return file_cache.get(path, backend.load)
+    if hooks:
+        start = perf_counter()
+        values = backend.load(string=string)
+        emit(LoadEvent("parse", perf_counter() - start))
+        return values
+    return backend.load(string=string)
+
+
+def cached_file(path: Path) -> Optional[Mapping[str, str]]:
+    """``file_cache.lookup(path)``, emitting a cache hit event if hooks are
+    installed."""
+    if not hooks:
+        return file_cache.lookup(path)
+    start = perf_counter()
+    values = file_cache.lookup(path)
+    if values is not None:
+        emit(LoadEvent("cache_hit", perf_counter() - start, path=str(path)))
+    return values
+
+
+def file_to_dict(
+    extension: str, path: Optional[Path] = None, string: Optional[str] = None
+) -> Mapping[str, str]:
+    return get_format(extension).load(path, string)
+
+
+def path_to_env(path: Path):
+    """Given a path it loads into os.environ all config files found in this path."""
+    os.environ.update(parse_path(path))
 
 
 def file_to_env(
     extension: str, path: Optional[Path] = None, string: Optional[str] = None
 ):
-    if extension == ".env":
-        load_env(path, string)
-    elif extension == ".toml":
-        load_toml(path, string)
-    elif extension in (".yaml", ".yml"):
-        load_yaml(path, string)
-    elif extension in (".ini", ".cfg"):
-        load_ini(path, string)
-    elif extension == ".json":
-        load_json(path, string)
+    os.environ.update(file_to_dict(extension, path, string))
 
 
 def load_path(path: Path):
-    for x in path.iterdir():
-        path_to_env(x)
+    os.environ.update(parse_path(path))
 
 
 def load_file(
@@ -119,30 +514,26 @@ def load_file(
     string: Optional[str] = None,
     extension: Optional[str] = None,
 ):
-    extension = path.suffix or path.name if path else extension
-    if extension in supported_extensions:
-        file_to_env(extension, path, string)
-    else:
-        raise NonSupportedExtension(f"Extension '{extension}' not supported")
+    os.environ.update(parse_file(path, string, extension))
 
 
 def dump(
     obj,
     path: Optional[PathLike] = None,
     extension: Optional[str] = None,
-):
+    fsync: bool = True,
+) -> Union[bytes, bool]:
+    """Dump ``obj`` to ``path`` in the format given by its extension.
+
+    The file is only written if its content changes, atomically (through a
+    temporary file renamed over ``path``). Returns whether it was written. Without
+    ``path``, the dump in the format given by ``extension`` is returned as bytes.
+    """
     path = Path(path) if path else None
-    extension = path.suffix or path.name if path else extension
-    if extension in supported_extensions:
-        if extension == ".env":
-            dump_env(obj, path)
-        elif extension == ".toml":
-            dump_toml(obj, path)
-        elif extension in (".yaml", ".yml"):
-            dump_yaml(obj, path)
-        elif extension in (".ini", ".cfg"):
-            dump_ini(obj, path)
-        elif extension == ".json":
-            dump_json(obj, path)
-    else:
-        raise NonSupportedExtension(f"Extension '{extension}' not supported")
+    backend = get_format(get_extension(path) if path else extension)
+    data = backend.dump(obj, None).encode()
+    if path is None:
+        return data
+    from configclasses.dumpers import write_if_changed
+
+    return write_if_changed(path, data, fsync)
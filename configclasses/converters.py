@@ -0,0 +1,278 @@
+import re
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from pathlib import PurePath
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    union_types: Tuple[Any, ...] = (Union, UnionType)
+else:
+    union_types = (Union,)
+
+Converter = Callable[[Any], Any]
+
+_converters: Dict[Any, Converter] = {}
+_sequence_types = (list, tuple, set, frozenset)
+_none_values = ("", "none", "null")
+_true_values = ("true", "1", "yes", "y", "on", "t")
+_false_values = ("false", "0", "no", "n", "off", "f", "")
+_timedelta_re = re.compile(
+    r"^(?:(?P<days>-?\d+) days?,?\s*)?"
+    r"(?P<hours>\d+):(?P<minutes>\d{1,2})(?::(?P<seconds>\d{1,2}(?:\.\d+)?))?$"
+)
+
+
+def register_converter(field_type, converter: Optional[Converter] = None):
+    """Use ``converter`` to convert the string values of fields annotated with
+    ``field_type``. It can be used as a decorator:
+
+        @register_converter(IPv4Address)
+        def to_ip(value: str) -> IPv4Address:
+            ...
+    """
+    if converter is None:
+        return lambda converter: register_converter(field_type, converter)
+    _converters[field_type] = converter
+    return converter
+
+
+def to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    normalized_value = str(value).strip().lower()
+    if normalized_value in _true_values:
+        return True
+    if normalized_value in _false_values:
+        return False
+    raise ValueError(f"'{value}' is not a valid boolean")
+
+
+def to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"'{value}' is not a valid decimal") from None
+
+
+def to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(_utc_suffix(str(value).strip()))
+
+
+def to_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+
+def to_time(value: Any) -> time:
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(_utc_suffix(str(value).strip()))
+
+
+def to_timedelta(value: Any) -> timedelta:
+    """Seconds (``"90"``, ``"1.5"``) or ``[D day[s], ]HH:MM[:SS[.ffffff]]``."""
+    if isinstance(value, timedelta):
+        return value
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        match = _timedelta_re.match(value)
+        if not match:
+            raise ValueError(f"'{value}' is not a valid timedelta") from None
+        parts = {name: float(part) for name, part in match.groupdict().items() if part}
+    else:
+        parts = {"seconds": seconds}
+    try:
+        return timedelta(**parts)
+    except OverflowError:
+        raise ValueError(f"'{value}' is out of the range of timedelta") from None
+
+
+def _utc_suffix(value: str) -> str:
+    # datetime.fromisoformat only accepts "Z" since Python 3.11
+    return value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value
+
+
+def _as_string(item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, (list, dict)):
+        from json import dumps
+
+        return dumps(item)
+    return str(item)
+
+
+def split_items(value: Any) -> List[Any]:
+    """A JSON array (``'[1, 2]'``), comma separated values (``"1, 2"``) or an
+    already parsed list."""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    value = value.strip()
+    if value.startswith("["):
+        from json import loads
+
+        return loads(value)
+    return [item.strip() for item in value.split(",")] if value else []
+
+
+def split_pairs(value: Any) -> Dict[Any, Any]:
+    """A JSON object (``'{"a": 1}'``), comma separated ``key=value`` pairs or an
+    already parsed dict."""
+    if isinstance(value, dict):
+        return value
+    value = value.strip()
+    if value.startswith("{"):
+        from json import loads
+
+        return loads(value)
+    pairs = (pair.split("=", 1) for pair in value.split(",") if pair.strip())
+    return {key.strip(): item.strip() for key, item in pairs}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def compile_converter(field_type) -> Optional[Converter]:
+    """Converter from a string (or, for containers, an already parsed list or dict)
+    to ``field_type``, or None if values are used as they are."""
+    if field_type in (str, Any) or isinstance(field_type, str):
+        return None
+    if field_type in _converters:
+        return _converters[field_type]
+
+    origin = get_origin(field_type)
+    args = get_args(field_type)
+    if origin in union_types:
+        return _compile_union(args)
+    if (origin or field_type) in _sequence_types:
+        return _compile_sequence(origin or field_type, args)
+    if (origin or field_type) is dict:
+        return _compile_mapping(args)
+
+    if isinstance(field_type, type):
+        if issubclass(field_type, Enum):
+            return _compile_enum(field_type)
+        if issubclass(field_type, PurePath):
+            return field_type
+        for registered_type, converter in _converters.items():
+            if isinstance(registered_type, type) and issubclass(
+                field_type, registered_type
+            ):
+                return converter
+    return None
+
+
+def _compile_union(args) -> Converter:
+    optional = type(None) in args
+    converters = [
+        compile_converter(arg) or _identity for arg in args if arg is not type(None)
+    ]
+
+    def to_union(value):
+        if optional and (value is None or str(value).strip().lower() in _none_values):
+            return None
+        errors = []
+        for converter in converters:
+            try:
+                return converter(value)
+            except (TypeError, ValueError) as error:
+                errors.append(str(error))
+        raise ValueError("; ".join(errors))
+
+    return to_union
+
+
+def _compile_sequence(container, args) -> Converter:
+    if container is tuple and args and args[-1] is not Ellipsis:
+        item_converters = [compile_converter(arg) or _identity for arg in args]
+
+        def to_fixed_tuple(value):
+            items = split_items(value)
+            if len(items) != len(item_converters):
+                raise ValueError(f"expected {len(item_converters)} items")
+            return tuple(
+                converter(_as_string(item))
+                for converter, item in zip(item_converters, items)
+            )
+
+        return to_fixed_tuple
+
+    item_converter = compile_converter(args[0]) if args else None
+    if item_converter is None:
+        return lambda value: container(split_items(value))
+    return lambda value: container(
+        item_converter(_as_string(item)) for item in split_items(value)
+    )
+
+
+def _compile_mapping(args) -> Converter:
+    key_converter = compile_converter(args[0]) if args else None
+    value_converter = compile_converter(args[1]) if args else None
+    key_converter = key_converter or _identity
+    value_converter = value_converter or _identity
+    return lambda value: {
+        key_converter(_as_string(key)): value_converter(_as_string(item))
+        for key, item in split_pairs(value).items()
+    }
+
+
+def _compile_enum(enum_type) -> Converter:
+    def to_enum(value):
+        if isinstance(value, enum_type):
+            return value
+        try:
+            return enum_type(value)
+        except ValueError:
+            pass
+        try:
+            return enum_type[value]
+        except KeyError:
+            pass
+        for member in enum_type:
+            if str(member.value) == value:
+                return member
+        raise ValueError(f"'{value}' is not a valid {enum_type.__name__}")
+
+    return to_enum
+
+
+def is_sequence_type(field_type) -> bool:
+    if get_origin(field_type) in union_types:
+        return any(is_sequence_type(arg) for arg in get_args(field_type))
+    return (get_origin(field_type) or field_type) in _sequence_types
+
+
+def is_mapping_type(field_type) -> bool:
+    if get_origin(field_type) in union_types:
+        return any(is_mapping_type(arg) for arg in get_args(field_type))
+    return (get_origin(field_type) or field_type) is dict
+
+
+register_converter(int, int)
+register_converter(float, float)
+register_converter(bool, to_bool)
+register_converter(Decimal, to_decimal)
+register_converter(datetime, to_datetime)
+register_converter(date, to_date)
+register_converter(time, to_time)
+register_converter(timedelta, to_timedelta)
@@ -1,51 +1,273 @@
+import hashlib
 import json
-from dataclasses import _MISSING_TYPE, asdict
+import math
+import os
+import secrets
+from contextlib import contextmanager
+from dataclasses import MISSING, fields, is_dataclass
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from io import StringIO
 from os import PathLike
+from pathlib import PurePath
+from typing import IO, Any, Iterator, Optional, Tuple, Union
 
+from configclasses.secret import Secret
 
-def dump_env_key(key, value):
-    try:
-        lines = [
-            f"{dump_env_key(key + '_' + sub_key, sub_value)}"
-            for sub_key, sub_value in value.__dict__.items()
-        ]
-        lines = [line for line in lines if line]
-        return "\n".join(lines)
-    except AttributeError:
-        return f"{key}={value}\n"
+_CHUNK_SIZE = 1024 * 1024
 
+Output = Optional[Union[PathLike, str, IO[str]]]
 
-def dump_env(obj, path: PathLike):
-    lines = [f"{dump_env_key(key, value)}" for key, value in obj.__dict__.items()]
-    with open(path, "w") as file:
-        file.writelines(lines)
 
+def iter_fields(obj) -> Iterator[Tuple[str, Any]]:
+    """``(name, value)`` of the fields of a configclass instance, without relying on
+    ``__dict__`` so slotted classes work too. Unset (``MISSING``) fields and secrets
+    are skipped."""
+    for field in fields(obj):
+        value = getattr(obj, field.name, MISSING)
+        if value is not MISSING and not isinstance(value, Secret):
+            yield field.name, value
 
-def dump_toml(obj, path):
-    raise NotImplementedError
 
+def split_fields(obj) -> Tuple[list, list]:
+    """Fields of ``obj`` split in scalar values and nested configclasses."""
+    values, sections = [], []
+    for name, value in iter_fields(obj):
+        (sections if is_dataclass(value) else values).append((name, value))
+    return values, sections
 
-def dump_yaml(obj, path):
-    raise NotImplementedError
 
+def to_primitive(value: Any) -> Any:
+    """``value`` as a JSON compatible value."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, Enum):
+        return to_primitive(value.value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (Decimal, PurePath)):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(key): to_primitive(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_primitive(item) for item in value]
+    if is_dataclass(value):
+        return {name: to_primitive(item) for name, item in iter_fields(value)}
+    return str(value)
 
-def dump_ini(obj, path):
-    raise NotImplementedError
 
+def to_string(value: Any) -> str:
+    """``value`` as it would be read back from an env var."""
+    value = to_primitive(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
 
-def dump_json_key(value):
-    try:
-        return {
-            key: sub_value
-            for key, sub_value in asdict(value).items()
-            if not isinstance(sub_value, _MISSING_TYPE)
-        }
-    except TypeError:
+
+@contextmanager
+def open_output(output: Output):
+    """Text file object to write to: ``output`` itself if it is already a file-like
+    object, the file at ``output`` if it is a path, or a ``StringIO``."""
+    if output is None:
+        yield StringIO()
+    elif hasattr(output, "write"):
+        yield output
+    else:
+        with open(output, "w", encoding="utf-8") as file:
+            yield file
+
+
+def dump_to(write_function, obj, output: Output) -> Optional[str]:
+    with open_output(output) as file:
+        write_function(obj, file)
+        if output is None:
+            return file.getvalue()
+    return None
+
+
+def write_env(obj, file: IO[str], parent_key: str = ""):
+    for name, value in iter_fields(obj):
+        key = f"{parent_key}{name}"
+        if is_dataclass(value):
+            write_env(value, file, f"{key}_")
+        elif value is not None:
+            file.write(f"{key}={env_value(to_string(value))}\n")
+
+
+def env_value(value: str) -> str:
+    if value and not any(char in value for char in " #'\"\\\n\t$"):
         return value
+    if "$" in value:
+        # Single-quoted values are not expanded when loaded back.
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def dump_env(obj, path: Output = None) -> Optional[str]:
+    return dump_to(write_env, obj, path)
+
+
+def write_toml(obj, file: IO[str], table: str = ""):
+    values, sections = split_fields(obj)
+    for name, value in values:
+        if value is not None:
+            file.write(f"{name} = {toml_value(to_primitive(value))}\n")
+    for name, section in sections:
+        section_table = f"{table}.{name}" if table else name
+        file.write(f"\n[{section_table}]\n")
+        write_toml(section, file, section_table)
+
+
+def toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and not math.isfinite(value):
+        return "nan" if math.isnan(value) else ("inf" if value > 0 else "-inf")
+    if isinstance(value, list):
+        return f"[{', '.join(toml_value(item) for item in value if item is not None)}]"
+    if isinstance(value, dict):
+        items = (
+            f"{json.dumps(key)} = {toml_value(item)}"
+            for key, item in value.items()
+            if item is not None
+        )
+        return f"{{{', '.join(items)}}}"
+    return json.dumps(value)
+
+
+def dump_toml(obj, path: Output = None) -> Optional[str]:
+    return dump_to(write_toml, obj, path)
+
+
+def write_yaml(obj, file: IO[str], indent: str = ""):
+    for name, value in iter_fields(obj):
+        if is_dataclass(value):
+            file.write(f"{indent}{name}:\n")
+            write_yaml(value, file, f"{indent}  ")
+        else:
+            # JSON scalars and flow collections are valid YAML.
+            file.write(f"{indent}{name}: {json.dumps(to_primitive(value))}\n")
+
 
+def dump_yaml(obj, path: Output = None) -> Optional[str]:
+    return dump_to(write_yaml, obj, path)
 
-def dump_json(obj, path: PathLike):
-    output = {key: dump_json_key(value) for key, value in obj.__dict__.items()}
 
-    with open(path, "w") as file:
-        json.dump(output, file)
+def write_ini(obj, file: IO[str]):
+    values, sections = split_fields(obj)
+    if values:
+        # Top level values go to the DEFAULT section, loaded back without prefix.
+        file.write("[DEFAULT]\n")
+        write_ini_values(values, file)
+    for name, section in sections:
+        write_ini_section(section, file, name)
+
+
+def write_ini_section(obj, file: IO[str], section_name: str):
+    values, sections = split_fields(obj)
+    if values:
+        file.write(f"\n[{section_name}]\n")
+        write_ini_values(values, file)
+    for name, section in sections:
+        write_ini_section(section, file, f"{section_name}_{name}")
+
+
+def write_ini_values(values, file: IO[str]):
+    for name, value in values:
+        if value is not None:
+            ini_value = to_string(value).replace("\n", "\n\t")
+            file.write(f"{name} = {ini_value}\n")
+
+
+def dump_ini(obj, path: Output = None) -> Optional[str]:
+    return dump_to(write_ini, obj, path)
+
+
+def write_json(obj, file: IO[str]):
+    file.write("{")
+    for number, (name, value) in enumerate(iter_fields(obj)):
+        if number:
+            file.write(", ")
+        file.write(f"{json.dumps(name)}: ")
+        if is_dataclass(value):
+            write_json(value, file)
+        else:
+            file.write(json.dumps(to_primitive(value)))
+    file.write("}")
+
+
+def dump_json(obj, path: Output = None) -> Optional[str]:
+    return dump_to(write_json, obj, path)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: Union[PathLike, str]) -> Optional[str]:
+    """``content_hash`` of the file at ``path``, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(_CHUNK_SIZE):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def write_if_changed(
+    path: Union[PathLike, str], data: bytes, fsync: bool = True
+) -> bool:
+    """Atomically replace the file at ``path`` with ``data`` unless it already has
+    that content. Returns whether the file was written.
+
+    ``data`` is written to a temporary file in the same directory which is fsync'd
+    and renamed over ``path``, so readers never see a partially written file.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        stat = None
+    if (
+        stat is not None
+        and stat.st_size == len(data)
+        and file_hash(path) == content_hash(data)
+    ):
+        return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(
+        directory, f".{os.path.basename(path)}.{secrets.token_hex(4)}.tmp"
+    )
+    mode = stat.st_mode & 0o7777 if stat is not None else 0o666
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    try:
+        if stat is not None and hasattr(os, "fchmod"):
+            # The mode given to os.open is masked by the umask.
+            os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself (POSIX only).
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
@@ -1,3 +1,6 @@
+from typing import List
+
+
 class NonSupportedExtension(Exception):
     pass
 
@@ -8,3 +11,26 @@ class ConfigFilePathDoesNotExist(Exception):
 
 class DependencyNotInstalled(Exception):
     pass
+
+
+class ConversionError(ValueError):
+    def __init__(self, key: str, value, error: Exception):
+        self.key = key
+        self.value = value
+        self.error = error
+        super().__init__(f"Invalid '{key}' value {value!r}: {error}")
+
+
+class ValidationError(ConversionError):
+    """Every invalid value found while loading a configclass. ``key``, ``value`` and
+    ``error`` are the ones of the first of ``errors``."""
+
+    def __init__(self, errors: List[ConversionError]):
+        self.errors = errors
+        first = errors[0]
+        ValueError.__init__(self, "\n".join(str(error) for error in errors))
+        self.key, self.value, self.error = first.key, first.value, first.error
+
+
+class InvalidSnapshot(ValueError):
+    pass
@@ -0,0 +1,136 @@
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from configclasses.exceptions import NonSupportedExtension
+
+Loader = Callable[..., Mapping[str, str]]
+Dumper = Callable[..., Optional[str]]
+
+
+def resolve(reference: Union[str, Callable]) -> Callable:
+    """``reference`` itself if it is already a callable, or the attribute pointed
+    by a ``"package.module:attribute"`` string."""
+    if not isinstance(reference, str):
+        return reference
+    module_name, _, attribute = reference.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+class FormatBackend:
+    """Loader and dumper of a config file format.
+
+    Both can be given as ``"package.module:attribute"`` strings, so the module
+    implementing them (and the parser it uses) is only imported the first time a
+    file of this format is loaded or dumped.
+
+    A loader is called as ``loader(path=None, string=None)`` and returns the
+    flattened values of the file. A dumper is called as ``dumper(obj, path)``: it
+    writes ``obj`` to ``path``, or returns it as a ``str`` when ``path`` is None.
+    """
+
+    __slots__ = ("name", "extensions", "_loader", "_dumper")
+
+    def __init__(
+        self,
+        name: str,
+        extensions: Iterable[str],
+        loader: Union[str, Loader],
+        dumper: Optional[Union[str, Dumper]] = None,
+    ):
+        self.name = name
+        self.extensions: Tuple[str, ...] = tuple(extensions)
+        self._loader = loader
+        self._dumper = dumper
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self.extensions!r})"
+
+    @property
+    def loader(self) -> Loader:
+        if isinstance(self._loader, str):
+            self._loader = resolve(self._loader)
+        return self._loader
+
+    @property
+    def dumper(self) -> Dumper:
+        if self._dumper is None:
+            raise NonSupportedExtension(f"Dumping to '{self.name}' is not supported")
+        if isinstance(self._dumper, str):
+            self._dumper = resolve(self._dumper)
+        return self._dumper
+
+    def load(
+        self, path: Optional[Path] = None, string: Optional[str] = None
+    ) -> Mapping[str, str]:
+        return self.loader(path, string)
+
+    def dump(self, obj, path):
+        return self.dumper(obj, path)
+
+
+_backends: Dict[str, FormatBackend] = {}
+
+
+def register_format(
+    name: str,
+    extensions: Iterable[str],
+    loader: Union[str, Loader],
+    dumper: Optional[Union[str, Dumper]] = None,
+) -> FormatBackend:
+    """Register a config file format for the given extensions (``".env"``,
+    ``".toml"``...), replacing any format registered before for them.
+
+    ``dumper(obj, path)`` must return the dump as a ``str`` when ``path`` is None,
+    see ``FormatBackend``."""
+    backend = FormatBackend(name, extensions, loader, dumper)
+    for extension in backend.extensions:
+        _backends[extension] = backend
+    return backend
+
+
+def get_format(extension: str) -> FormatBackend:
+    try:
+        return _backends[extension]
+    except KeyError:
+        raise NonSupportedExtension(f"Extension '{extension}' not supported")
+
+
+def is_supported(extension: str) -> bool:
+    return extension in _backends
+
+
+def supported_extensions() -> Tuple[str, ...]:
+    return tuple(_backends)
+
+
+register_format(
+    "env",
+    (".env",),
+    "configclasses.loaders:parse_env",
+    "configclasses.dumpers:dump_env",
+)
+register_format(
+    "toml",
+    (".toml",),
+    "configclasses.loaders:parse_toml",
+    "configclasses.dumpers:dump_toml",
+)
+register_format(
+    "yaml",
+    (".yaml", ".yml"),
+    "configclasses.loaders:parse_yaml",
+    "configclasses.dumpers:dump_yaml",
+)
+register_format(
+    "ini",
+    (".ini", ".cfg"),
+    "configclasses.loaders:parse_ini",
+    "configclasses.dumpers:dump_ini",
+)
+register_format(
+    "json",
+    (".json",),
+    "configclasses.loaders:parse_json",
+    "configclasses.dumpers:dump_json",
+)
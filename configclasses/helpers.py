@@ -1,54 +1,179 @@
 import os
-from dataclasses import is_dataclass
-from typing import Any, Dict, List, Optional, Tuple
-
-supported_extensions = (".env", ".toml", ".yaml", ".yml", ".ini", ".cfg", ".json")
-converter_types = (int, float)
-
-
-def get_field_value_from_environ(field_name: Any):
-    return os.environ.get(str.upper(field_name)) or os.environ.get(field_name)
-
-
-def get_default_value(field_name: Any, defaults: Dict[str, str]) -> Optional[str]:
-    if defaults:
-        return defaults.get(str.upper(field_name)) or defaults.get(field_name)
-
-
-def fill_init_dict(
-    class_fields: List[Tuple[Any, Any, Any]], defaults, parent_field_name, prefix
-):
-    init_dict = {}
-    for class_field_name, class_field_type, class_field_default in class_fields:
-        origin_field_name = get_origin_field_name(
-            class_field_name, parent_field_name, prefix
-        )
-
-        if is_dataclass(class_field_type):
-            init_dict[class_field_name] = class_field_type.from_environ(
-                defaults, origin_field_name
-            )
-        elif field_value := get_field_value_from_environ(
-            origin_field_name
-        ) or get_default_value(origin_field_name, defaults):
-            fill_with_environ_or_provided_defaults(
-                class_field_name, class_field_type, field_value, init_dict
-            )
-        else:
-            init_dict[class_field_name] = class_field_default
-
-    return init_dict
-
-
-def fill_with_environ_or_provided_defaults(
-    class_field_name, class_field_type, field_value, init_dict
-):
-    if class_field_type in converter_types:
-        init_dict[class_field_name] = class_field_type(field_value)
-    elif class_field_type == bool:
-        init_dict[class_field_name] = field_value in ("True", "true")
-    else:
-        init_dict[class_field_name] = field_value
+from bisect import bisect_left
+from collections import ChainMap
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+def environ_items():
+    """``os.environ.items()`` without the encode/decode round trip that
+    ``os._Environ`` does for every single key lookup."""
+    data = getattr(os.environ, "_data", None)
+    if data is None:
+        return os.environ.items()
+    decodekey, decodevalue = os.environ.decodekey, os.environ.decodevalue
+    return ((decodekey(key), decodevalue(value)) for key, value in data.items())
+
+
+def encode_environ_keys(keys: Iterable[str]) -> Tuple:
+    """``keys`` the way ``os.environ`` stores them, for ``environ_fingerprint``."""
+    encodekey = getattr(os.environ, "encodekey", None)
+    if encodekey is None or getattr(os.environ, "_data", None) is None:
+        return tuple(keys)
+    return tuple(encodekey(key) for key in keys)
+
+
+def environ_fingerprint(encoded_keys: Tuple) -> Tuple:
+    """Current values of ``encoded_keys`` in ``os.environ``, read straight from its
+    underlying data (no decoding), to cheaply detect when any of them changes."""
+    data = getattr(os.environ, "_data", None)
+    if data is None:
+        return tuple(map(os.environ.get, encoded_keys))
+    return tuple(map(data.get, encoded_keys))
+
+
+def environ_scan(prefixes: Tuple[str, ...]) -> Tuple:
+    """``(key, value)`` of the env vars whose lower-cased name starts with any of
+    ``prefixes``, for fingerprinting fields filled from every key under a prefix."""
+    index = environ_index()
+    return tuple(item for prefix in prefixes for item in index.scan(prefix).items())
+
+
+class KeyIndex(dict):
+    """Case-normalized keys and their values, which can also be scanned by prefix.
+
+    Keys are kept sorted (lazily, on the first scan) so finding every key under
+    ``app_feature_`` is a binary search plus a walk over the matches instead of a
+    pass over the whole index. Indexes are built once and then only read; the
+    sorted keys are rebuilt if keys were added after a scan.
+    """
+
+    __slots__ = ("_sorted_keys",)
+
+    def _keys(self) -> List[str]:
+        sorted_keys = getattr(self, "_sorted_keys", None)
+        if sorted_keys is None or len(sorted_keys) != len(self):
+            sorted_keys = self._sorted_keys = sorted(self)
+        return sorted_keys
+
+    def scan(self, prefix: str) -> Dict[str, str]:
+        """Every key starting with ``prefix`` (case-insensitive) and its value."""
+        prefix = prefix.lower()
+        keys = self._keys()
+        items = {}
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[position]
+            if not key.startswith(prefix):
+                break
+            items[key] = self[key]
+        return items
+
+
+def scan_prefix(index: Mapping[str, str], prefix: str) -> Dict[str, str]:
+    """``KeyIndex.scan`` for any index: a ``KeyIndex``, a ``ChainMap`` of them (the
+    first map holding a key wins) or, scanning every key, a plain mapping."""
+    if isinstance(index, (KeyIndex, EnvironIndex)):
+        return index.scan(prefix)
+    if isinstance(index, ChainMap):
+        items = {}
+        for mapping in reversed(index.maps):
+            items.update(scan_prefix(mapping, prefix))
+        return items
+    prefix = prefix.lower()
+    return {key: value for key, value in index.items() if key.startswith(prefix)}
+
+
+def index_mapping(mapping: Optional[Mapping[str, str]]) -> KeyIndex:
+    """Case-normalized copy of ``mapping``, so every key is resolved with a single
+    lookup. When several spellings of a key exist, the upper-case one wins."""
+    if mapping is os.environ:
+        return KeyIndex(environ_index())
+    index = KeyIndex()
+    if mapping:
+        for key, value in mapping.items():
+            normalized_key = key.lower()
+            if normalized_key not in index or key.isupper():
+                index[normalized_key] = value
+    return index
+
+
+def upper_case_items(mapping: Mapping[str, str]) -> Dict[str, str]:
+    """The ``UPPER_CASE`` keys of ``mapping``, lower-cased, and their values."""
+    if mapping is os.environ:
+        return _indexed_environ()[2]
+    return {key.lower(): value for key, value in mapping.items() if key.isupper()}
+
+
+_environ_snapshot: List[Tuple[Mapping, KeyIndex, Dict[str, str]]] = []
+
+
+def _indexed_environ() -> Tuple[Mapping, KeyIndex, Dict[str, str]]:
+    """The raw data of ``os.environ`` the last time it was indexed, its
+    ``index_mapping`` and ``upper_case_items``. They are rebuilt only once the
+    environment differs from that data, which comparing two dicts tells in C."""
+    data = getattr(os.environ, "_data", os.environ)
+    if _environ_snapshot:
+        snapshot = _environ_snapshot[0]
+        if snapshot[0] == data:
+            return snapshot
+    index = KeyIndex()
+    upper_case = {}
+    for key, value in environ_items():
+        normalized_key = key.lower()
+        if key.isupper():
+            index[normalized_key] = upper_case[normalized_key] = value
+        elif normalized_key not in index:
+            index[normalized_key] = value
+    snapshot = (dict(data), index, upper_case)
+    _environ_snapshot[:] = [snapshot]
+    return snapshot
+
+
+def environ_index() -> KeyIndex:
+    """``index_mapping(os.environ)``, shared by every load (and its sorted keys by
+    every prefix scan) until the environment changes. Don't modify it."""
+    return _indexed_environ()[1]
+
+
+def environ_get(key: str) -> Optional[str]:
+    """Value of the upper-case, or else the lower-case, spelling of ``key`` in
+    ``os.environ``; only the value found is decoded."""
+    data = getattr(os.environ, "_data", None)
+    if data is None:
+        value = os.environ.get(key.upper())
+        return os.environ.get(key) if value is None else value
+    encodekey = os.environ.encodekey
+    value = data.get(encodekey(key.upper()))
+    if value is None:
+        value = data.get(encodekey(key))
+    return None if value is None else os.environ.decodevalue(value)
+
+
+class EnvironIndex:
+    """Index of ``os.environ`` over ``defaults`` resolving keys as they are looked
+    up, by their upper- and lower-case spellings, instead of copying the whole
+    environment first. Only prefix scans index it."""
+
+    __slots__ = ("defaults",)
+
+    def __init__(self, defaults: Optional[Mapping[str, str]] = None):
+        self.defaults = index_mapping(defaults) if defaults else None
+
+    def get(self, key: str, default=None):
+        value = environ_get(key)
+        if value is None and self.defaults is not None:
+            value = self.defaults.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def scan(self, prefix: str) -> Dict[str, str]:
+        items = self.defaults.scan(prefix) if self.defaults is not None else {}
+        items.update(environ_index().scan(prefix))
+        return items
 
 
 def get_origin_field_name(class_field_name, parent_field_name, prefix):
@@ -0,0 +1,194 @@
+import os
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+from configclasses.exceptions import ConversionError, ValidationError
+from configclasses.plan import (
+    LoadPlan,
+    build_instance,
+    convert_value,
+    default_value,
+    find_value,
+)
+from configclasses.sources import build_index
+
+
+class LoadEvent(NamedTuple):
+    """A timed step of loading a config, passed to every installed hook.
+
+    ``phase`` is one of:
+
+    - ``"read"``: reading a config file, ``size`` is the number of bytes read,
+    - ``"parse"``: parsing and flattening a config file,
+    - ``"cache_hit"``: a config file served by the parsed files cache,
+    - ``"index"``: snapshotting env vars, files and defaults for ``cls``,
+    - ``"fill"``: resolving the fields of ``cls`` and its nested configclasses,
+      ``lookups`` is the number of keys looked up,
+    - ``"convert"``: converting their values (not included in ``"fill"``),
+    - ``"load"``: a whole ``from_path`` or ``from_string`` call.
+    """
+
+    phase: str
+    duration: float
+    cls: Optional[type] = None
+    path: Optional[str] = None
+    size: int = 0
+    lookups: int = 0
+
+
+Hook = Callable[[LoadEvent], Any]
+
+hooks: List[Hook] = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: Hook) -> Hook:
+    """Call ``hook(event)`` with a ``LoadEvent`` for every step of loading configs.
+    Returns the hook, so it can be used as a decorator.
+
+    Hooks are called synchronously from the loading thread (including the threads
+    parsing the files of a directory). While no hook is installed nothing is
+    measured at all.
+    """
+    with _hooks_lock:
+        hooks[:] = [*hooks, hook]
+    return hook
+
+
+def remove_hook(hook: Hook):
+    with _hooks_lock:
+        hooks[:] = [installed for installed in hooks if installed != hook]
+
+
+def emit(event: LoadEvent):
+    for hook in list(hooks):
+        hook(event)
+
+
+def instrumented_parser(backend) -> Callable[[Path], Mapping[str, str]]:
+    """``backend.load`` timing the read and parse of the file separately."""
+
+    def parse(path: Path) -> Mapping[str, str]:
+        start = perf_counter()
+        with open(path, "r", encoding="utf-8") as config_file:
+            string = config_file.read()
+            size = os.fstat(config_file.fileno()).st_size
+        read = perf_counter()
+        values = backend.load(string=string)
+        parsed = perf_counter()
+        emit(LoadEvent("read", read - start, path=str(path), size=size))
+        emit(LoadEvent("parse", parsed - read, path=str(path)))
+        return values
+
+    return parse
+
+
+def instrumented_get(file_cache, path: Path, backend) -> Mapping[str, str]:
+    """``file_cache.get(path, backend.load)`` emitting its read and parse events
+    on a miss, or a cache hit event."""
+    parse = instrumented_parser(backend)
+    misses = []
+
+    def parse_miss(path: Path):
+        misses.append(path)
+        return parse(path)
+
+    start = perf_counter()
+    values = file_cache.get(path, parse_miss)
+    if not misses:
+        emit(LoadEvent("cache_hit", perf_counter() - start, path=str(path)))
+    return values
+
+
+def instrumented_load(plan: LoadPlan, environ=None, defaults=None):
+    """``execute_plan(plan, build_index(environ, defaults))`` emitting the index,
+    fill and convert events of ``plan.cls``."""
+    start = perf_counter()
+    index = build_index(environ, defaults)
+    indexed = perf_counter()
+    totals = [0.0, 0]  # conversion seconds, lookups
+    errors: List[ConversionError] = []
+    instance = _execute(plan, index, totals, errors)
+    filled = perf_counter()
+    convert, lookups = totals
+    emit(LoadEvent("index", indexed - start, plan.cls))
+    emit(LoadEvent("fill", filled - indexed - convert, plan.cls, lookups=lookups))
+    emit(LoadEvent("convert", convert, plan.cls))
+    if errors:
+        raise ValidationError(errors)
+    return instance
+
+
+def _execute(plan: LoadPlan, index: Mapping[str, str], totals: List, errors: List):
+    # execute_plan measuring lookups and conversions; kept out of execute_plan so
+    # it has no measuring overhead.
+    init_dict = {}
+    for step in plan.steps:
+        if step.plan is not None:
+            init_dict[step.name] = _execute(step.plan, index, totals, errors)
+            continue
+        totals[1] += 1
+        field_value = find_value(step, index)
+        if field_value is None:
+            init_dict[step.name] = default_value(step)
+            continue
+        start = perf_counter()
+        init_dict[step.name] = convert_value(step, field_value, errors)
+        totals[0] += perf_counter() - start
+    return build_instance(plan, init_dict, errors)
+
+
+class PhaseStats(NamedTuple):
+    count: int
+    total: float
+    max: float
+
+
+class StatsCollector:
+    """Hook aggregating events in memory: durations per class (or per file for
+    file events) and phase, and counters of files parsed, bytes read, cache hits
+    and keys looked up::
+
+        stats = add_hook(StatsCollector())
+        AppConfig.from_path("config/")
+        stats.as_dict()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._phases: Dict[str, Dict[str, PhaseStats]] = {}
+            self._counters = dict.fromkeys(
+                ("files_parsed", "bytes_read", "cache_hits", "lookups"), 0
+            )
+
+    def __call__(self, event: LoadEvent):
+        name = event.cls.__qualname__ if event.cls is not None else event.path
+        with self._lock:
+            phases = self._phases.setdefault(name, {})
+            count, total, maximum = phases.get(event.phase, (0, 0.0, 0.0))
+            phases[event.phase] = PhaseStats(
+                count + 1, total + event.duration, max(maximum, event.duration)
+            )
+            counters = self._counters
+            counters["files_parsed"] += event.phase == "parse"
+            counters["bytes_read"] += event.size
+            counters["cache_hits"] += event.phase == "cache_hit"
+            counters["lookups"] += event.lookups
+
+    def as_dict(self) -> Dict[str, Any]:
+        """``{"phases": {name: {phase: {"count", "total", "max"}}}, "counters": {...}}``
+        with durations in seconds."""
+        with self._lock:
+            return {
+                "phases": {
+                    name: {phase: stats._asdict() for phase, stats in phases.items()}
+                    for name, phases in self._phases.items()
+                },
+                "counters": dict(self._counters),
+            }
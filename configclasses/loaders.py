@@ -1,74 +1,179 @@
 import configparser
 import os
+import re
+from functools import lru_cache, partial
 from io import StringIO
-from json import loads
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
 
 from configclasses.exceptions import DependencyNotInstalled
-from configclasses.helpers import normalize_field_name
 
 
-def load_env(path: Optional[Path] = None, string: Optional[str] = None):
+@lru_cache(maxsize=None)
+def get_dotenv_parser() -> Callable:
     try:
-        from dotenv import load_dotenv
+        from dotenv import dotenv_values
     except ImportError:
         raise DependencyNotInstalled("You must install 'python-dotenv'")
-    if path:
-        load_dotenv(dotenv_path=path, override=True)
-    else:
-        load_dotenv(stream=StringIO(string), override=True)
+    return dotenv_values
 
 
-def load_dict(dict: Dict[str, str]):
-    for k, v in dict.items():
-        if isinstance(v, Dict):
-            inner_dict = {
-                f"{k}_{inner_key}": inner_value for inner_key, inner_value in v.items()
-            }
-            load_dict(inner_dict)
-            continue
-        os.environ[normalize_field_name(k)] = str(v)
-
+@lru_cache(maxsize=None)
+def get_toml_parser() -> Callable[[str], Dict]:
+    """The fastest TOML parser available: stdlib ``tomllib`` (read-only, Python 3.11+)
+    or ``tomlkit``."""
+    try:
+        from tomllib import loads
 
-def load_toml(path: Optional[Path] = None, string: Optional[str] = None):
+        return loads
+    except ImportError:
+        pass
     try:
         from tomlkit import parse
     except ImportError:
         raise DependencyNotInstalled("You must install 'tomlkit'")
+    return parse
 
-    if path:
-        with path.open("r") as config_file:
-            cfg = parse(config_file.read())
-    else:
-        cfg = parse(string)
-    load_dict(cfg)
 
-
-def load_yaml(path: Optional[Path] = None, string: Optional[str] = None):
+@lru_cache(maxsize=None)
+def get_yaml_parser() -> Callable[[str], Dict]:
+    """``yaml.load`` with the libyaml based ``CSafeLoader`` when PyYAML was built
+    with it, or the pure Python ``SafeLoader`` otherwise."""
     try:
-        from yaml import full_load
+        import yaml
     except ImportError:
         raise DependencyNotInstalled("You must install pyyaml")
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return partial(yaml.load, Loader=loader)
+
+
+@lru_cache(maxsize=None)
+def get_json_parser() -> Callable[[str], Dict]:
+    """``orjson.loads`` if installed, ``json.loads`` otherwise."""
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+    return loads
 
+
+def read_text(path: Optional[Path] = None, string: Optional[str] = None) -> str:
     if path:
-        with path.open("r") as config_file:
-            cfg = full_load(config_file.read())
-    else:
-        cfg = full_load(string)
-    load_dict(cfg)
+        with open(path, "r", encoding="utf-8") as config_file:
+            return config_file.read()
+    return string
 
 
-def load_ini(path: Optional[Path] = None, string: Optional[str] = None):
+def parse_env(
+    path: Optional[Path] = None, string: Optional[str] = None
+) -> Dict[str, str]:
+    """``${VAR}`` references are expanded, except in single-quoted values, which
+    are kept as written like in a shell."""
+    dotenv_values = get_dotenv_parser()
+    text = read_text(path, string)
+    values = dotenv_values(stream=StringIO(text))
+    if "${" in text:
+        values.update(single_quoted_values(text))
+    return {k: v for k, v in values.items() if v is not None}
+
+
+_single_quoted = re.compile(r"\s*(?:export\s+)?(?:'[^']*'|[^=\s]+)\s*=\s*'")
+
+
+def single_quoted_values(text: str) -> Dict[str, str]:
+    """Values of ``text`` written in single quotes, without variable expansion."""
+    from dotenv.parser import parse_stream
+
+    return {
+        binding.key: binding.value
+        for binding in parse_stream(StringIO(text))
+        if binding.key is not None and _single_quoted.match(binding.original.string)
+    }
+
+
+_scalar_types = (str, int, float)
+
+
+def iter_flat_items(dict: Mapping[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Lazily yield the ``(key, value)`` leaves of a nested document.
+
+    Nested keys are joined with ``_`` and list items get their index as key, so
+    ``{"db": {"hosts": ["a", "b"]}}`` yields ``("db_hosts_0", "a")`` and
+    ``("db_hosts_1", "b")``. Documents are walked with an explicit stack: the key
+    of every container is built once and every leaf key is joined once.
+    """
+    stack = [("", iter(dict.items()))]
+    while stack:
+        parent_key, items = stack[-1]
+        for k, v in items:
+            if isinstance(v, _scalar_types):
+                yield f"{parent_key}{k}".lower(), str(v)
+            elif isinstance(v, Mapping):
+                stack.append((f"{parent_key}{k}_".lower(), iter(v.items())))
+                break
+            elif isinstance(v, (list, tuple)):
+                stack.append((f"{parent_key}{k}_".lower(), enumerate(v)))
+                break
+            else:
+                yield f"{parent_key}{k}".lower(), str(v)
+        else:
+            stack.pop()
+
+
+def flatten_dict(dict: Mapping[str, Any]) -> Dict[str, str]:
+    flat_dict = {}
+    flat_dict.update(iter_flat_items(dict))
+    return flat_dict
+
+
+def parse_toml(
+    path: Optional[Path] = None, string: Optional[str] = None
+) -> Dict[str, str]:
+    return flatten_dict(get_toml_parser()(read_text(path, string)))
+
+
+def parse_yaml(
+    path: Optional[Path] = None, string: Optional[str] = None
+) -> Dict[str, str]:
+    return flatten_dict(get_yaml_parser()(read_text(path, string)))
+
+
+def parse_ini(
+    path: Optional[Path] = None, string: Optional[str] = None
+) -> Dict[str, str]:
     cfg = configparser.ConfigParser()
-    cfg.read(path) if path else cfg.read_string(string)
-    load_dict(cfg.__dict__["_sections"])
+    cfg.read_string(read_text(path, string))
+    # Values of the DEFAULT section are the ones without a section prefix.
+    values = flatten_dict(cfg.defaults())
+    values.update(flatten_dict(cfg.__dict__["_sections"]))
+    return values
+
+
+def parse_json(
+    path: Optional[Path] = None, string: Optional[str] = None
+) -> Dict[str, str]:
+    return flatten_dict(get_json_parser()(read_text(path, string)))
+
+
+def load_dict(dict: Mapping[str, Any]):
+    os.environ.update(iter_flat_items(dict))
+
+
+def load_env(path: Optional[Path] = None, string: Optional[str] = None):
+    os.environ.update(parse_env(path, string))
+
+
+def load_toml(path: Optional[Path] = None, string: Optional[str] = None):
+    os.environ.update(parse_toml(path, string))
+
+
+def load_yaml(path: Optional[Path] = None, string: Optional[str] = None):
+    os.environ.update(parse_yaml(path, string))
+
+
+def load_ini(path: Optional[Path] = None, string: Optional[str] = None):
+    os.environ.update(parse_ini(path, string))
 
 
 def load_json(path: Optional[Path] = None, string: Optional[str] = None):
-    if path:
-        with path.open("r") as config_file:
-            cfg = loads(config_file.read())
-    else:
-        cfg = loads(string)
-    load_dict(cfg)
+    os.environ.update(parse_json(path, string))
@@ -0,0 +1,289 @@
+import sys
+from dataclasses import MISSING, fields, is_dataclass
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from configclasses.converters import (
+    compile_converter,
+    is_mapping_type,
+    is_sequence_type,
+)
+from configclasses.exceptions import ConversionError, ValidationError
+from configclasses.helpers import (
+    get_origin_field_name,
+    normalize_field_name,
+    scan_prefix,
+)
+from configclasses.secret import (
+    collect_secret,
+    is_secret_type,
+    iter_secret_reference_keys,
+)
+from configclasses.validators import compile_validators, with_checks
+
+
+class FieldStep(NamedTuple):
+    """How to fill one field: where to look for its value and how to convert it."""
+
+    name: str
+    key: str
+    converter: Optional[Callable[[Any], Any]]
+    collect: Optional[Callable[[Mapping[str, str], str], Any]]
+    default: Any
+    default_factory: Any
+    plan: Optional["LoadPlan"]
+
+
+class LoadPlan(NamedTuple):
+    """Precompiled steps to build an instance of ``cls``.
+
+    Env key names (prefix and nested parent path included) and converters are
+    resolved once, so loading a config is a loop over ``steps``. ``keys`` are the
+    keys of every field of ``cls`` and its nested configclasses, ``stems`` the ones
+    of the fields also read from keys starting with ``<key>_`` (lists, mappings and
+    secret references).
+    """
+
+    cls: type
+    steps: Tuple[FieldStep, ...]
+    intern: Optional[Callable[[Any], Any]] = None
+    keys: FrozenSet[str] = frozenset()
+    stems: FrozenSet[str] = frozenset()
+
+
+def collect_items(index: Mapping[str, str], key: str) -> Optional[List[str]]:
+    """Items of a list flattened from a config file as ``key_0``, ``key_1``..."""
+    items = []
+    while (item := index.get(f"{key}_{len(items)}")) is not None:
+        items.append(item)
+    return items or None
+
+
+def collect_mapping(index: Mapping[str, str], key: str) -> Optional[Dict[str, str]]:
+    """Every key under ``key_`` (a table flattened from a config file, or env vars
+    like ``KEY_NAME``) by the rest of its lower-cased name."""
+    prefix = f"{key}_"
+    items = {
+        name[len(prefix) :]: value for name, value in scan_prefix(index, prefix).items()
+    }
+    return items or None
+
+
+def get_collect(field_type) -> Optional[Callable[[Mapping[str, str], str], Any]]:
+    if is_secret_type(field_type):
+        return collect_secret
+    if is_sequence_type(field_type):
+        return collect_items
+    if is_mapping_type(field_type):
+        return collect_mapping
+    return None
+
+
+def compile_plan(
+    cls, prefix: Optional[str] = None, parent_field_name: Optional[str] = None
+) -> LoadPlan:
+    """Compile the steps to build ``cls``. Field annotations are resolved with
+    ``get_type_hints``, so ``from __future__ import annotations`` is supported
+    (a NameError is raised if they reference names not defined yet).
+
+    Validators given in ``field(metadata={"validators": [...]})`` or as
+    ``Annotated`` metadata are compiled into the converter of their field.
+
+    For ``compact`` configclasses ``str`` values are interned and, if they are
+    frozen and nested in another configclass, instances are deduplicated through
+    their pool."""
+    type_hints = get_type_hints(cls, include_extras=True)
+    compact = getattr(cls, "__configclass_compact__", False)
+    pool = getattr(cls, "__configclass_pool__", None)
+    steps = []
+    keys, stems = set(), set()
+    for field in fields(cls):
+        if not field.init:
+            continue
+        field_type = type_hints.get(field.name, field.type)
+        validators = list(field.metadata.get("validators", ()))
+        if get_origin(field_type) is Annotated:
+            field_type, *extras = get_args(field_type)
+            validators.extend(extras)
+        key = get_origin_field_name(field.name, parent_field_name, prefix)
+        nested_plan = (
+            compile_plan(field_type, parent_field_name=key)
+            if is_dataclass(field_type)
+            else None
+        )
+        converter = compile_converter(field_type)
+        if compact and field_type is str:
+            converter = sys.intern
+        step = FieldStep(
+            field.name,
+            normalize_field_name(key),
+            with_checks(converter, compile_validators(validators)),
+            get_collect(field_type),
+            field.default,
+            field.default_factory,
+            nested_plan,
+        )
+        steps.append(step)
+        if nested_plan is not None:
+            keys |= nested_plan.keys
+            stems |= nested_plan.stems
+        else:
+            keys.add(step.key)
+            if step.collect is not None:
+                stems.add(step.key)
+    intern = pool.intern if pool is not None and parent_field_name else None
+    return LoadPlan(cls, tuple(steps), intern, frozenset(keys), frozenset(stems))
+
+
+def execute_plan(plan: LoadPlan, index: Mapping[str, str]):
+    """Build ``plan.cls`` resolving every key against ``index`` (see ``build_index``).
+
+    Every field is converted and validated even after one fails, and all of them
+    are reported in a single ``ValidationError``."""
+    errors: List[ConversionError] = []
+    instance = _execute(plan, index, errors)
+    if errors:
+        raise ValidationError(errors)
+    return instance
+
+
+def _execute(plan: LoadPlan, index: Mapping[str, str], errors: List[ConversionError]):
+    init_dict = {}
+    for step in plan.steps:
+        if step.plan is not None:
+            init_dict[step.name] = _execute(step.plan, index, errors)
+        else:
+            init_dict[step.name] = resolve_step(step, index, errors)
+    return build_instance(plan, init_dict, errors)
+
+
+def resolve_step(step: FieldStep, index: Mapping[str, str], errors: List):
+    """Value of the field of ``step``: found in ``index`` and converted, or its
+    default. Conversion errors are appended to ``errors`` (and ``None`` returned).
+
+    ``execute_plan``, ``rebuild_plan``, provenance recording and instrumentation
+    all resolve fields with ``find_value``, ``convert_value`` and
+    ``default_value``, so they can't disagree on how a field is filled."""
+    field_value = find_value(step, index)
+    if field_value is None:
+        return default_value(step)
+    return convert_value(step, field_value, errors)
+
+
+def find_value(step: FieldStep, index: Mapping[str, str]) -> Any:
+    """Raw value of the field of ``step`` in ``index``, ``None`` if it has none."""
+    field_value = index.get(step.key)
+    if field_value is None and step.collect is not None:
+        field_value = step.collect(index, step.key)
+    return field_value
+
+
+def convert_value(step: FieldStep, field_value: Any, errors: List) -> Any:
+    if step.converter is None:
+        return field_value
+    try:
+        return step.converter(field_value)
+    except (TypeError, ValueError) as error:
+        errors.append(ConversionError(step.key, field_value, error))
+        return None
+
+
+def default_value(step: FieldStep) -> Any:
+    if step.default_factory is not MISSING:
+        return step.default_factory()
+    return step.default
+
+
+def build_instance(plan: LoadPlan, init_dict: Dict[str, Any], errors: List):
+    """``plan.cls(**init_dict)``, interned if the plan says so, or ``None`` if any
+    field failed."""
+    if errors:
+        return None
+    instance = plan.cls(**init_dict)
+    return instance if plan.intern is None else plan.intern(instance)
+
+
+def iter_plan_keys(plan: LoadPlan) -> Iterator[str]:
+    """Every key ``execute_plan`` may read to build ``plan.cls``, including the keys
+    of the references of secrets (``key_file``). The indexed items of list fields
+    are covered by ``iter_plan_prefixes`` instead."""
+    for step in plan.steps:
+        if step.plan is not None:
+            yield from iter_plan_keys(step.plan)
+            continue
+        yield step.key
+        if step.collect is collect_secret:
+            yield from iter_secret_reference_keys(step.key)
+
+
+def iter_plan_prefixes(plan: LoadPlan) -> Iterator[str]:
+    """Prefixes of the keys ``execute_plan`` may read to fill list and mapping
+    fields (``key_0``, ``key_1``... or ``key_name``)."""
+    for step in plan.steps:
+        if step.plan is not None:
+            yield from iter_plan_prefixes(step.plan)
+        elif step.collect is collect_items or step.collect is collect_mapping:
+            yield f"{step.key}_"
+
+
+def key_stems(keys: Iterable[str]) -> FrozenSet[str]:
+    """Every ``<stem>`` of the keys such that a key starts with ``<stem>_``."""
+    return frozenset(
+        key[:position]
+        for key in keys
+        for position, character in enumerate(key)
+        if character == "_" and position
+    )
+
+
+def plan_reads_any(plan: LoadPlan, keys: FrozenSet[str], stems: FrozenSet[str]) -> bool:
+    """Whether building ``plan.cls`` reads any of ``keys``, whose ``key_stems`` are
+    ``stems``."""
+    return not keys.isdisjoint(plan.keys) or not stems.isdisjoint(plan.stems)
+
+
+def rebuild_plan(
+    plan: LoadPlan,
+    instance: Any,
+    index: Mapping[str, str],
+    keys: FrozenSet[str],
+    stems: FrozenSet[str],
+    errors: List[ConversionError],
+):
+    """``instance`` with the fields reading any of ``keys`` resolved again against
+    ``index``. Nested configclasses reading none of them, and instances whose
+    values all stay equal, are returned as they are."""
+    init_dict = {}
+    modified = False
+    for step in plan.steps:
+        old_value = getattr(instance, step.name)
+        if step.plan is not None:
+            value = (
+                rebuild_plan(step.plan, old_value, index, keys, stems, errors)
+                if plan_reads_any(step.plan, keys, stems)
+                else old_value
+            )
+        elif step.key in keys or (step.collect is not None and step.key in stems):
+            value = resolve_step(step, index, errors)
+        else:
+            value = old_value
+        modified = modified or (value is not old_value and value != old_value)
+        init_dict[step.name] = value
+    if not modified and not errors:
+        return instance
+    return build_instance(plan, init_dict, errors)
@@ -0,0 +1,233 @@
+import os
+from array import array
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from configclasses.exceptions import ConversionError, ValidationError
+from configclasses.helpers import (
+    KeyIndex,
+    index_mapping,
+    scan_prefix,
+    upper_case_items,
+)
+from configclasses.plan import (
+    FieldStep,
+    LoadPlan,
+    build_instance,
+    collect_items,
+    convert_value,
+    default_value,
+    find_value,
+)
+from configclasses.secret import collect_secret, secret_reference_key
+from configclasses.sources import Source
+
+
+class SourceInfo(NamedTuple):
+    """A source of values: ``kind`` is ``"file"`` (``path`` tells which one),
+    ``"environ"``, ``"mapping"`` (an explicit ``environ``), ``"defaults"`` (the
+    ``defaults`` dict), ``"default"`` (the dataclass field default) or ``"nested"``."""
+
+    kind: str
+    path: Optional[str] = None
+
+
+class Origin(NamedTuple):
+    """Where the value of a field came from, and its value before conversion."""
+
+    source: str
+    path: Optional[str]
+    line: Optional[int]
+    raw: Any
+
+
+class Provenance:
+    """Origins of the fields of one instance, in the order of the steps of its plan:
+    ids into the recorder's table of sources, and the raw values."""
+
+    __slots__ = ("plan", "source_ids", "raw_values")
+
+    def __init__(self, plan: LoadPlan, source_ids: array, raw_values: Tuple):
+        self.plan = plan
+        self.source_ids = source_ids
+        self.raw_values = raw_values
+
+
+class ProvenanceRecorder:
+    """Records where the fields of every configclass instance built while it is
+    active come from. See ``record_provenance``."""
+
+    def __init__(self):
+        self._sources: List[SourceInfo] = []
+        self._source_ids: Dict[SourceInfo, int] = {}
+        self._records: Dict[int, Tuple[Any, Provenance]] = {}
+
+    def source_id(self, source: SourceInfo) -> int:
+        """Interned id of ``source``: every instance refers to the same entry."""
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self._sources)
+            self._sources.append(source)
+        return source_id
+
+    def build(self, plan: LoadPlan, environ=None, defaults=None):
+        """Same as ``execute_plan(plan, build_index(environ, defaults))``, recording
+        the origin of every field."""
+        index, origins = self._index(environ, defaults)
+        errors: List[ConversionError] = []
+        instance = self._execute(plan, index, origins, errors)
+        if errors:
+            raise ValidationError(errors)
+        return instance
+
+    def explain(self, instance) -> Dict[str, Origin]:
+        """Origin of every field of ``instance`` by field name, with dotted names
+        for the fields of nested configclasses (``"db.host"``)."""
+        record = self._records.get(id(instance))
+        if record is None or record[0] is not instance:
+            raise LookupError(f"{instance!r} was not loaded while recording provenance")
+        return self._explain(record[1], instance, "", {})
+
+    def _explain(
+        self, provenance: Provenance, instance, parent: str, lines: Dict[str, Dict]
+    ) -> Dict[str, Origin]:
+        origins = {}
+        for step, source_id, raw in zip(
+            provenance.plan.steps, provenance.source_ids, provenance.raw_values
+        ):
+            name = f"{parent}{step.name}"
+            source = self._sources[source_id]
+            if source.kind == "nested":
+                nested = getattr(instance, step.name, None)
+                record = self._records.get(id(nested))
+                if record is not None and record[0] is nested:
+                    origins.update(self._explain(record[1], nested, f"{name}.", lines))
+                continue
+            line = None
+            if source.kind == "file" and source.path:
+                if source.path not in lines:
+                    lines[source.path] = env_file_lines(source.path)
+                line = lines[source.path].get(step.key)
+            origins[name] = Origin(source.kind, source.path, line, raw)
+        return origins
+
+    def _index(self, environ, defaults) -> Tuple[KeyIndex, KeyIndex]:
+        if isinstance(environ, Source):
+            layers, names = environ.layers, environ.names or ()
+        else:
+            layers, names = (os.environ if environ is None else environ,), ()
+        index, origins = KeyIndex(), KeyIndex()
+        named_layers = [(defaults, SourceInfo("defaults"))]
+        for position in reversed(range(len(layers))):
+            layer = layers[position]
+            name = names[position] if position < len(names) else None
+            if layer is os.environ:
+                source = SourceInfo("environ")
+            elif name is not None:
+                source = SourceInfo("file", name)
+            else:
+                source = SourceInfo("mapping")
+            named_layers.append((layer, source))
+        # Same precedence as Source.index: upper-case spellings win last.
+        upper_case, upper_case_origins = {}, {}
+        for position, (layer, source) in enumerate(named_layers):
+            source_id = self.source_id(source)
+            layer_index = index_mapping(layer)
+            index.update(layer_index)
+            origins.update(dict.fromkeys(layer_index, source_id))
+            if position and layer:
+                layer_upper_case = upper_case_items(layer)
+                upper_case.update(layer_upper_case)
+                upper_case_origins.update(dict.fromkeys(layer_upper_case, source_id))
+        index.update(upper_case)
+        origins.update(upper_case_origins)
+        return index, origins
+
+    def _execute(
+        self, plan: LoadPlan, index: KeyIndex, origins: KeyIndex, errors: List
+    ):
+        # execute_plan with the origin of every field; kept out of execute_plan so
+        # it has no recording overhead.
+        init_dict = {}
+        source_ids = array("H")
+        raw_values = []
+        for step in plan.steps:
+            if step.plan is not None:
+                init_dict[step.name] = self._execute(step.plan, index, origins, errors)
+                source_ids.append(self.source_id(SourceInfo("nested")))
+                raw_values.append(None)
+                continue
+            field_value = find_value(step, index)
+            if field_value is None:
+                init_dict[step.name] = default_value(step)
+                source_ids.append(self.source_id(SourceInfo("default")))
+                raw_values.append(None)
+                continue
+            source_ids.append(self._origin(step, index, origins))
+            raw_values.append(field_value)
+            init_dict[step.name] = convert_value(step, field_value, errors)
+        instance = build_instance(plan, init_dict, errors)
+        if instance is not None:
+            # Keyed by the interned instance, the one explain() is called with.
+            self._records[id(instance)] = (
+                instance,
+                Provenance(plan, source_ids, tuple(raw_values)),
+            )
+        return instance
+
+    @staticmethod
+    def _origin(step: FieldStep, index: KeyIndex, origins: KeyIndex) -> int:
+        key, collect = step.key, step.collect
+        if index.get(key) is not None:
+            return origins[key]
+        if collect is collect_items:
+            return origins[f"{key}_0"]
+        if collect is collect_secret:
+            return origins[secret_reference_key(index, key)]
+        return next(iter(scan_prefix(origins, f"{key}_").values()))
+
+
+def env_file_lines(path: str) -> Mapping[str, int]:
+    """Line number of every key of a ``.env`` file by normalized key. Other formats
+    are nested or multi-line, so their values are reported without a line."""
+    if not path.endswith(".env"):
+        return {}
+    lines = {}
+    try:
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                line = line.strip()
+                if line.startswith("export "):
+                    line = line[len("export ") :]
+                key, separator, _ = line.partition("=")
+                if separator and not key.startswith("#"):
+                    lines[key.strip().lower()] = number
+    except OSError:
+        return {}
+    return lines
+
+
+recording: ContextVar[Optional[ProvenanceRecorder]] = ContextVar(
+    "configclasses_provenance", default=None
+)
+
+
+@contextmanager
+def record_provenance() -> Iterator[ProvenanceRecorder]:
+    """Record where the fields of the configclasses loaded in this block (and
+    context, so it is safe with threads and asyncio) come from::
+
+        with record_provenance() as provenance:
+            config = AppConfig.from_path("config/")
+        provenance.explain(config)["db.host"]
+        # Origin(source='file', path='config/app.env', line=3, raw='localhost')
+
+    Loading with no recorder active costs a single context variable lookup.
+    """
+    recorder = ProvenanceRecorder()
+    token = recording.set(recorder)
+    try:
+        yield recorder
+    finally:
+        recording.reset(token)
@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, List, Mapping, Optional, TypeVar, Union
+
+from configclasses.exceptions import ConversionError, ValidationError
+from configclasses.helpers import normalize_field_name
+from configclasses.plan import key_stems, plan_reads_any, rebuild_plan
+from configclasses.sources import Source, build_index
+
+T = TypeVar("T")
+
+
+def rebuild(
+    instance: T,
+    changed_keys: Iterable[str],
+    environ: Optional[Union[Mapping[str, str], Source]] = None,
+    defaults: Optional[Dict[str, str]] = None,
+    prefix: Optional[str] = None,
+) -> T:
+    """A copy of ``instance`` loaded again (as ``from_environ`` does) for the fields
+    reading any of ``changed_keys`` only, e.g. after ``APP_DB_HOST`` changed::
+
+        config = rebuild(config, ["APP_DB_HOST"])
+
+    Nested configclasses whose fields read none of the keys, or whose values stay
+    equal, are reused as they are, so ``new.db is old.db`` tells whether a section
+    changed; ``instance`` itself is returned if nothing did. ``prefix`` must be the
+    one ``instance`` was loaded with, if not the one of its class.
+    """
+    cls = type(instance)
+    plan = cls.__configclass_plan__(cls, None, prefix)
+    keys = frozenset(map(normalize_field_name, changed_keys))
+    stems = key_stems(keys)
+    if not plan_reads_any(plan, keys, stems):
+        return instance
+    errors: List[ConversionError] = []
+    rebuilt = rebuild_plan(
+        plan, instance, build_index(environ, defaults), keys, stems, errors
+    )
+    if errors:
+        raise ValidationError(errors)
+    return rebuilt
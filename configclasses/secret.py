@@ -0,0 +1,151 @@
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Union, get_args, get_origin
+
+from configclasses.converters import register_converter, union_types
+
+Resolver = Callable[[str], str]
+
+_resolvers: Dict[str, Resolver] = {}
+# One lock for every secret, so they can be copied and pickled; resolving is
+# rare and idempotent.
+_resolve_lock = threading.Lock()
+
+
+class _Unresolved:
+    def __repr__(self):
+        return "<unresolved>"
+
+    def __reduce__(self):
+        # Copies and unpickled secrets keep referring to the same marker.
+        return "_unresolved"
+
+
+_unresolved = _Unresolved()
+
+
+class Secret:
+    """A secret config value, hidden from ``repr`` and from dumped configs.
+
+    Secrets set with a reference instead of a value (``DB_PASSWORD_FILE`` for a
+    ``password: Secret`` field, see ``register_secret_resolver``) are only read
+    when ``get()`` is first called, and then kept.
+    """
+
+    __slots__ = ("_value", "_resolver", "_reference")
+
+    def __init__(
+        self,
+        value: Any = _unresolved,
+        resolver: Optional[Resolver] = None,
+        reference: Optional[str] = None,
+    ):
+        if value is _unresolved and resolver is None:
+            raise TypeError("Secret needs a value or a resolver")
+        self._value = value
+        self._resolver = resolver
+        self._reference = reference
+
+    def get(self) -> Any:
+        """The secret value, resolving it on the first call."""
+        if self._value is _unresolved:
+            with _resolve_lock:
+                if self._value is _unresolved:
+                    self._value = self._resolver(self._reference)
+        return self._value
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not _unresolved
+
+    def _identity(self):
+        if self._resolver is not None:
+            return (self._resolver, self._reference)
+        return (None, self._value)
+
+    def __eq__(self, other):
+        if not isinstance(other, Secret):
+            return NotImplemented
+        return self._identity() == other._identity()
+
+    def __hash__(self):
+        return hash(self._identity())
+
+    def __repr__(self):
+        return f"{type(self).__name__}('**********')"
+
+    __str__ = __repr__
+
+
+def register_secret_resolver(suffix: str, resolver: Resolver) -> Resolver:
+    """Resolve ``Secret`` fields set through a ``<KEY>_<SUFFIX>`` reference with
+    ``resolver(reference)``, e.g. ``DB_PASSWORD_VAULT=db/password`` after::
+
+        register_secret_resolver("vault", DirectoryVault("/etc/vault"))
+
+    ``FILE`` is registered by default to read the file at the given path.
+    """
+    _resolvers[suffix.lower()] = resolver
+    return resolver
+
+
+def read_secret_file(path: str) -> str:
+    """Content of the file at ``path`` without its trailing newline."""
+    with open(path, "r") as secret_file:
+        return secret_file.read().rstrip("\r\n")
+
+
+class DirectoryVault:
+    """Resolver reading secrets from the files of a directory, standing in for a
+    secrets manager: the reference ``db/password`` is the file ``db/password``
+    under ``root``."""
+
+    def __init__(self, root: Union[str, os.PathLike]):
+        self.root = Path(root).resolve()
+
+    def __call__(self, reference: str) -> str:
+        path = (self.root / reference).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"'{reference}' is outside of the vault")
+        return read_secret_file(str(path))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.root)!r})"
+
+
+def to_secret(value: Any) -> Secret:
+    return value if isinstance(value, Secret) else Secret(value)
+
+
+def is_secret_type(field_type) -> bool:
+    if get_origin(field_type) in union_types:
+        return any(is_secret_type(arg) for arg in get_args(field_type))
+    return field_type is Secret
+
+
+def secret_reference_key(index: Mapping[str, str], key: str) -> Optional[str]:
+    """The ``<key>_<suffix>`` key setting a reference to the secret ``key``."""
+    for suffix in _resolvers:
+        reference_key = f"{key}_{suffix}"
+        if index.get(reference_key) is not None:
+            return reference_key
+    return None
+
+
+def collect_secret(index: Mapping[str, str], key: str) -> Optional[Secret]:
+    """A lazy ``Secret`` for the first registered reference found for ``key``."""
+    reference_key = secret_reference_key(index, key)
+    if reference_key is None:
+        return None
+    suffix = reference_key[len(key) + 1 :]
+    return Secret(resolver=_resolvers[suffix], reference=index[reference_key])
+
+
+def iter_secret_reference_keys(key: str):
+    for suffix in _resolvers:
+        yield f"{key}_{suffix}"
+
+
+register_converter(Secret, to_secret)
+register_secret_resolver("file", read_secret_file)
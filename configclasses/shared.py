@@ -0,0 +1,199 @@
+import os
+import secrets
+import struct
+import sys
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Type, TypeVar, Union
+
+from configclasses.configclasses import _from_values, parse_path
+from configclasses.snapshot import decode_snapshot, encode_snapshot
+from configclasses.sources import Source
+
+T = TypeVar("T")
+
+# magic, sequence number (odd while publishing), payload size, data segment name
+_control = struct.Struct("<8sQQ64s")
+_magic = b"CCSHARE\x01"
+_no_hash = bytes(32)
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing segment without the resource tracker of this process
+    taking ownership of it: before Python 3.13 attaching registers the segment, so
+    it is unlinked (and a leak is reported) as soon as any worker exits."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+
+    def register_others(resource_name: str, resource_type: str):
+        if resource_type != "shared_memory" or resource_name.lstrip("/") != name:
+            register(resource_name, resource_type)
+
+    with _attach_lock:
+        resource_tracker.register = register_others
+        try:
+            return SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedConfigPublisher:
+    """Publishes flattened config values in shared memory, for worker processes to
+    load configclasses from with a ``SharedConfigReader`` instead of reading and
+    parsing the config files again::
+
+        publisher = SharedConfigPublisher()
+        publisher.publish_path("config/", AppConfig)
+        # in the workers
+        config = SharedConfigReader(publisher.name).load(AppConfig)
+
+    Every publish writes the values to a new read-only data segment and bumps the
+    version of the control segment named ``name``, so readers pick up reloads.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        # Short names: macOS limits them to 31 characters.
+        self.name = name or f"cc{secrets.token_hex(6)}"
+        self._control = SharedMemory(self.name, create=True, size=_control.size)
+        self._control.buf[: _control.size] = _control.pack(_magic, 0, 0, b"")
+        self._segment: Optional[SharedMemory] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return _control.unpack_from(self._control.buf)[1] // 2
+
+    def publish(self, values: Mapping[str, str]) -> int:
+        """Publish ``values`` as the next version, which is returned."""
+        payload = encode_snapshot("", _no_hash, values)
+        with self._lock:
+            sequence = _control.unpack_from(self._control.buf)[1]
+            version = sequence // 2 + 1
+            segment = SharedMemory(
+                f"{self.name}_{version}", create=True, size=max(len(payload), 1)
+            )
+            segment.buf[: len(payload)] = payload
+            buffer = self._control.buf
+            # Readers retry while the sequence number is odd or changed under them.
+            struct.pack_into("<Q", buffer, 8, sequence + 1)
+            struct.pack_into("<Q64s", buffer, 16, len(payload), segment.name.encode())
+            struct.pack_into("<Q", buffer, 8, sequence + 2)
+            previous, self._segment = self._segment, segment
+        if previous is not None:
+            # Readers already attached to it keep their mapping.
+            previous.close()
+            previous.unlink()
+        return version
+
+    def publish_path(
+        self,
+        config_path: Union[str, os.PathLike],
+        cls: Optional[type] = None,
+        defaults: Optional[Dict[str, str]] = None,
+        **path_options: Any,
+    ) -> int:
+        """Publish the values of the config files in ``config_path`` (see
+        ``parse_path``). If ``cls`` is given it is loaded from them first, so
+        invalid values raise here instead of being published."""
+        values = parse_path(Path(config_path), **path_options)
+        if cls is not None:
+            _from_values(cls, values, defaults, False, str(config_path))
+        return self.publish(values)
+
+    def close(self):
+        """Close and remove the shared memory segments."""
+        with self._lock:
+            for segment in (self._segment, self._control):
+                if segment is not None:
+                    segment.close()
+                    segment.unlink()
+            self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedConfigReader:
+    """Loads configclasses from the values published by the
+    ``SharedConfigPublisher`` named ``name``, typically in another process.
+
+    Values are copied out of shared memory once per published version. They are
+    layered over env vars and ``defaults`` like the files of ``from_path``: a
+    published key beats the env var of the same spelling, but an ``UPPER_CASE``
+    env var beats a lower-case published key.
+    """
+
+    def __init__(self, name: str, timeout: float = 5.0):
+        self.name = name
+        self.timeout = timeout
+        self._control = _attach(name)
+        if bytes(self._control.buf[:8]) != _magic:
+            self._control.close()
+            raise ValueError(f"'{name}' is not a shared config segment")
+        self._version = -1
+        self._values: Mapping[str, str] = {}
+
+    @property
+    def version(self) -> int:
+        """The last published version, 0 if nothing was published yet."""
+        return _control.unpack_from(self._control.buf)[1] // 2
+
+    def values(self) -> Mapping[str, str]:
+        """The values of the last published version."""
+        if self.version != self._version:
+            self._version, self._values = self._read()
+        return self._values
+
+    def load(self, cls: Type[T], defaults: Optional[Dict[str, str]] = None) -> T:
+        values = self.values()
+        return cls.from_environ(
+            defaults,
+            environ=Source(
+                values,
+                os.environ,
+                names=(f"<shared {self.name}@{self._version}>", None),
+            ),
+        )
+
+    def _read(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            _, sequence, size, segment_name = _control.unpack_from(self._control.buf)
+            if sequence == 0:
+                return 0, {}
+            if sequence % 2 == 0:
+                try:
+                    segment = _attach(segment_name.rstrip(b"\0").decode())
+                except FileNotFoundError:
+                    # Replaced and removed by a newer version meanwhile.
+                    segment = None
+                if segment is not None:
+                    try:
+                        if _control.unpack_from(self._control.buf)[1] == sequence:
+                            return (
+                                sequence // 2,
+                                decode_snapshot(segment.buf[:size]).values,
+                            )
+                    finally:
+                        segment.close()
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not read shared config '{self.name}'")
+            time.sleep(0.001)
+
+    def close(self):
+        self._control.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,133 @@
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Mapping, NamedTuple, Sequence, Union
+
+from configclasses.configclasses import list_config_files, parse_path
+from configclasses.dumpers import write_if_changed
+from configclasses.exceptions import InvalidSnapshot
+
+# magic, sources hash, number of entries, length of the source path
+_header = struct.Struct("<8s32sII")
+_magic = b"CCSNAP\x00\x01"
+
+
+class Snapshot(NamedTuple):
+    source: str
+    sources_hash: bytes
+    values: Dict[str, str]
+
+
+def sources_hash(root: Path, files: Sequence[Path]) -> bytes:
+    """sha256 of the names and contents of the config ``files`` found in ``root``."""
+    digest = hashlib.sha256()
+    for file in files:
+        name = file.relative_to(root).as_posix() if root.is_dir() else file.name
+        content = file.read_bytes()
+        digest.update(f"{name}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.digest()
+
+
+def encode_snapshot(source: str, digest: bytes, values: Mapping[str, str]) -> bytes:
+    """Snapshot layout: a header (magic, sources hash, number of entries, length of
+    the source path), the source path, a table with the byte length of every key
+    and value, then the UTF-8 keys and values one after the other."""
+    encoded_source = source.encode()
+    items = [(key.encode(), value.encode()) for key, value in values.items()]
+    lengths = [length for key, value in items for length in (len(key), len(value))]
+    return b"".join(
+        (
+            _header.pack(_magic, digest, len(items), len(encoded_source)),
+            encoded_source,
+            struct.pack(f"<{len(lengths)}I", *lengths),
+            *(part for item in items for part in item),
+        )
+    )
+
+
+def compile_snapshot(
+    config_path: Union[str, os.PathLike],
+    snapshot_path: Union[str, os.PathLike],
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+) -> bool:
+    """Parse the config files in ``config_path`` (as ``from_path`` does) and save
+    their flattened values to ``snapshot_path``. Returns whether the snapshot file
+    changed."""
+    root = Path(config_path).resolve()
+    files = list_config_files(root, order, pattern, exclude)
+    values = parse_path(root, order, pattern, exclude)
+    data = encode_snapshot(str(root), sources_hash(root, files), values)
+    return write_if_changed(snapshot_path, data)
+
+
+def read_snapshot(snapshot_path: Union[str, os.PathLike]) -> Snapshot:
+    """Read a snapshot through a memory map, without any parser."""
+    with open(snapshot_path, "rb") as snapshot_file:
+        try:
+            with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return decode_snapshot(data)
+        except (ValueError, struct.error) as error:
+            # Also raised for empty (ValueError) or truncated (struct.error) files.
+            raise InvalidSnapshot(
+                f"'{snapshot_path}' is not a valid config snapshot: {error}"
+            )
+
+
+def decode_snapshot(data) -> Snapshot:
+    """Decode a snapshot from a bytes-like object, e.g. a memory map."""
+    magic, digest, count, source_length = _header.unpack_from(data)
+    if magic != _magic:
+        raise ValueError("unknown format or version")
+    offset = _header.size
+    source = str(data[offset : offset + source_length], "utf-8")
+    offset += source_length
+    lengths = struct.unpack_from(f"<{2 * count}I", data, offset)
+    offset += 8 * count
+    values = {}
+    for position in range(0, 2 * count, 2):
+        key_end = offset + lengths[position]
+        value_end = key_end + lengths[position + 1]
+        values[str(data[offset:key_end], "utf-8")] = str(
+            data[key_end:value_end], "utf-8"
+        )
+        offset = value_end
+    if offset != len(data):
+        raise ValueError("unexpected end of the snapshot")
+    return Snapshot(source, digest, values)
+
+
+def is_stale(
+    snapshot: Snapshot,
+    order: Sequence[str] = (),
+    pattern: str = "**/*",
+    exclude: Sequence[str] = (),
+) -> bool:
+    """Whether the config files the snapshot was compiled from changed since. A
+    snapshot whose source no longer exists (e.g. only the snapshot was shipped)
+    is never stale."""
+    root = Path(snapshot.source)
+    if not root.exists():
+        return False
+    files = list_config_files(root, order, pattern, exclude)
+    return sources_hash(root, files) != snapshot.sources_hash
+
+
+def load_snapshot(
+    snapshot_path: Union[str, os.PathLike], verify: bool = True, **path_options: Any
+) -> Mapping[str, str]:
+    """Values of the snapshot or, if ``verify`` is set and the snapshot is stale, of
+    its original config files. ``path_options`` must be the ones the snapshot was
+    compiled with, see ``parse_path``."""
+    snapshot = read_snapshot(snapshot_path)
+    if verify:
+        walk_options = {
+            name: value for name, value in path_options.items() if name != "max_workers"
+        }
+        if is_stale(snapshot, **walk_options):
+            return parse_path(Path(snapshot.source), **path_options)
+    return snapshot.values
@@ -0,0 +1,61 @@
+import os
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+from configclasses.helpers import (
+    EnvironIndex,
+    KeyIndex,
+    index_mapping,
+    upper_case_items,
+)
+
+
+class Source:
+    """Stack of key/value layers: the first layer holding a key wins, except that
+    an ``UPPER_CASE`` spelling of a key (e.g. an env var) wins over the other
+    spellings in any layer. Keys are probed upper-case first, the way they were
+    when config files were loaded into ``os.environ``, so a ``PORT`` env var still
+    beats a ``port`` read from a file, while a file's ``PORT`` overrides it.
+
+    Config files are parsed into a Source instead of being written into
+    ``os.environ``, so loading them has no process-wide side effects.
+
+    ``names`` (one per layer, e.g. the path of the file it was parsed from) are
+    only used to report where values come from, see ``record_provenance``.
+    """
+
+    __slots__ = ("layers", "names")
+
+    def __init__(
+        self, *layers: Mapping[str, str], names: Optional[Sequence[str]] = None
+    ):
+        self.layers = layers
+        self.names = names
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self.layers)} layers)"
+
+    def index(self, defaults: Optional[Mapping[str, str]] = None) -> KeyIndex:
+        index = index_mapping(defaults)
+        upper_case: Dict[str, str] = {}
+        for layer in reversed(self.layers):
+            index.update(index_mapping(layer))
+            upper_case.update(upper_case_items(layer))
+        index.update(upper_case)
+        return index
+
+
+def build_index(
+    environ: Optional[Union[Mapping[str, str], Source]] = None,
+    defaults: Optional[Mapping[str, str]] = None,
+) -> Union[KeyIndex, EnvironIndex]:
+    """One snapshot of ``environ`` over ``defaults``.
+
+    The returned index maps lower-cased keys to their values and can list every
+    key under a prefix with ``index.scan("APP_FEATURE_")``. Without ``environ``,
+    ``os.environ`` is not copied: the keys of the fields are looked up in it
+    directly by their upper- and lower-case spellings (see ``EnvironIndex``)."""
+    if environ is None:
+        return EnvironIndex(defaults)
+    if isinstance(environ, Source):
+        return environ.index(defaults)
+    return Source(environ).index(defaults)
@@ -0,0 +1,199 @@
+import operator
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+Check = Callable[[Any], None]
+
+
+class Validator(ABC):
+    """A field constraint. ``compile()`` returns a function raising ValueError for
+    invalid (already converted) values; it is called once per field when the load
+    plan of a configclass is compiled.
+
+    Constraints are given in the field metadata or with ``Annotated``::
+
+        port: int = field(default=80, metadata={"validators": [Port()]})
+        workers: Annotated[int, Ge(1), Le(64)] = 4
+    """
+
+    @abstractmethod
+    def compile(self) -> Check: ...
+
+    def __repr__(self):
+        arguments = ", ".join(repr(value) for value in vars(self).values())
+        return f"{type(self).__name__}({arguments})"
+
+
+class _Bound(Validator):
+    symbol = ""
+    compare: Callable[[Any, Any], bool] = staticmethod(operator.eq)
+
+    def __init__(self, bound: Any):
+        self.bound = bound
+
+    def compile(self) -> Check:
+        bound, compare = self.bound, self.compare
+        message = f"must be {self.symbol} {bound!r}"
+
+        def check(value):
+            if not compare(value, bound):
+                raise ValueError(message)
+
+        return check
+
+
+class Gt(_Bound):
+    symbol, compare = ">", staticmethod(operator.gt)
+
+
+class Ge(_Bound):
+    symbol, compare = ">=", staticmethod(operator.ge)
+
+
+class Lt(_Bound):
+    symbol, compare = "<", staticmethod(operator.lt)
+
+
+class Le(_Bound):
+    symbol, compare = "<=", staticmethod(operator.le)
+
+
+class MinLen(Validator):
+    def __init__(self, length: int):
+        self.length = length
+
+    def compile(self) -> Check:
+        length = self.length
+
+        def check(value):
+            if len(value) < length:
+                raise ValueError(f"must have at least {length} items")
+
+        return check
+
+
+class MaxLen(Validator):
+    def __init__(self, length: int):
+        self.length = length
+
+    def compile(self) -> Check:
+        length = self.length
+
+        def check(value):
+            if len(value) > length:
+                raise ValueError(f"must have at most {length} items")
+
+        return check
+
+
+class Regex(Validator):
+    """The whole value must match ``pattern``."""
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+
+    def compile(self) -> Check:
+        fullmatch = re.compile(self.pattern, self.flags).fullmatch
+        pattern = self.pattern
+
+        def check(value):
+            if fullmatch(str(value)) is None:
+                raise ValueError(f"must match {pattern!r}")
+
+        return check
+
+
+class OneOf(Validator):
+    def __init__(self, *choices: Any):
+        self.choices = choices
+
+    def compile(self) -> Check:
+        choices = frozenset(self.choices)
+        message = f"must be one of {', '.join(map(repr, self.choices))}"
+
+        def check(value):
+            if value not in choices:
+                raise ValueError(message)
+
+        return check
+
+
+class Port(Validator):
+    """A TCP/UDP port number, 1 to 65535."""
+
+    def compile(self) -> Check:
+        def check(value):
+            if not 1 <= value <= 65535:
+                raise ValueError("must be a port number between 1 and 65535")
+
+        return check
+
+
+class Url(Validator):
+    """A URL with a host and, if given, one of ``schemes``."""
+
+    def __init__(self, schemes: Optional[Sequence[str]] = None):
+        self.schemes = tuple(schemes) if schemes else None
+
+    def compile(self) -> Check:
+        from urllib.parse import urlsplit
+
+        schemes = self.schemes
+
+        def check(value):
+            try:
+                url = urlsplit(str(value))
+            except ValueError as error:
+                raise ValueError(f"must be a URL: {error}")
+            if not url.scheme or not url.netloc:
+                raise ValueError("must be a URL with a scheme and a host")
+            if schemes and url.scheme not in schemes:
+                raise ValueError(f"URL scheme must be one of {', '.join(schemes)}")
+
+        return check
+
+
+class Predicate(Validator):
+    """Values for which ``function(value)`` is false are invalid."""
+
+    def __init__(self, function: Callable[[Any], bool], message: str = "is not valid"):
+        self.function = function
+        self.message = message
+
+    def compile(self) -> Check:
+        function, message = self.function, self.message
+
+        def check(value):
+            if not function(value):
+                raise ValueError(message)
+
+        return check
+
+
+def compile_validators(validators: Iterable[Any]) -> List[Check]:
+    """Checks of the ``Validator`` instances in ``validators``; other objects (e.g.
+    unrelated ``Annotated`` metadata) are ignored."""
+    return [
+        validator.compile()
+        for validator in validators
+        if isinstance(validator, Validator)
+    ]
+
+
+def with_checks(
+    converter: Optional[Callable], checks: List[Check]
+) -> Optional[Callable]:
+    """``converter`` followed by ``checks``, as a single converter."""
+    if not checks:
+        return converter
+
+    def convert_and_check(value):
+        if converter is not None:
+            value = converter(value)
+        for check in checks:
+            check(value)
+        return value
+
+    return convert_and_check
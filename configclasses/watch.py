@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Signature = Dict[str, Tuple[int, int]]
+
+
+def files_signature(path: Path) -> Signature:
+    """``(st_mtime_ns, st_size)`` of ``path`` or of every file found under it."""
+    signature = {}
+    pending = [str(path)]
+    while pending:
+        current = pending.pop()
+        try:
+            stat = os.stat(current)
+        except FileNotFoundError:
+            continue
+        if os.path.isdir(current):
+            try:
+                pending.extend(entry.path for entry in os.scandir(current))
+            except FileNotFoundError:
+                continue
+        else:
+            signature[current] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+
+class ConfigHolder:
+    """Holds the current instance of a watched configclass.
+
+    Readers just use ``holder.current``: a reload swaps the reference in a single
+    assignment, so they always see either the old or the new instance.
+    """
+
+    def __init__(self, instance, watcher: Optional["ConfigWatcher"] = None):
+        self.current = instance
+        self.last_error: Optional[Exception] = None
+        self._callbacks: List[Callable] = []
+        self._watcher = watcher
+
+    def subscribe(self, callback: Callable):
+        """Call ``callback(old, new)`` after every reload. Returns the callback,
+        so it can be used as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable):
+        self._callbacks.remove(callback)
+
+    def swap(self, instance):
+        """Replace the current instance and notify the subscribers. An exception
+        raised by a subscriber is stored in ``last_error`` and does not keep the
+        other ones from being called (nor stop the watcher)."""
+        old, self.current = self.current, instance
+        for callback in list(self._callbacks):
+            try:
+                callback(old, instance)
+            except Exception as error:
+                self.last_error = error
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class ConfigWatcher:
+    """Polls the files under ``config_path`` and reloads the configclass when they
+    change.
+
+    A change is only applied once the files have been stable for ``debounce``
+    seconds, so a burst of writes triggers a single reload. Reloads go through
+    ``from_path`` and therefore through the parsed files cache: only the files
+    that changed are parsed again.
+    """
+
+    def __init__(
+        self,
+        cls,
+        config_path,
+        defaults: Optional[Dict[str, str]] = None,
+        interval: float = 1.0,
+        debounce: float = 0.2,
+        path_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.cls = cls
+        self.config_path = Path(config_path)
+        self.defaults = defaults
+        self.interval = interval
+        self.debounce = debounce
+        self.path_options = path_options or {}
+        self._signature = files_signature(self.config_path)
+        self.holder = ConfigHolder(self._load(), self)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"configclasses-watch-{cls.__name__}", daemon=True
+        )
+
+    def start(self) -> ConfigHolder:
+        self._thread.start()
+        return self.holder
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            signature = files_signature(self.config_path)
+            if signature == self._signature:
+                continue
+            signature = self._wait_until_stable(signature)
+            if signature is None:
+                return
+            self._signature = signature
+            self.reload()
+
+    def _wait_until_stable(self, signature: Signature) -> Optional[Signature]:
+        deadline = time.monotonic() + self.debounce
+        while True:
+            if self._stop.wait(max(deadline - time.monotonic(), 0)):
+                return None
+            current = files_signature(self.config_path)
+            if current == signature:
+                return signature
+            signature = current
+            deadline = time.monotonic() + self.debounce
+
+    def _load(self):
+        return self.cls.from_path(self.config_path, self.defaults, **self.path_options)
+
+    def reload(self):
+        """Load the config again and swap it into the holder. If loading fails the
+        current instance is kept and the error is stored in ``holder.last_error``."""
+        try:
+            instance = self._load()
+        except Exception as error:
+            self.holder.last_error = error
+            return
+        self.holder.last_error = None
+        self.holder.swap(instance)
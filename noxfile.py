@@ -16,3 +16,17 @@ def coverage(session):
     finally:
         # Display coverage report even when tests fail.
         session.run("coverage", "report")
+
+
+@nox.session
+def benchmarks(session):
+    """Run the benchmark suite against .benchmarks/baseline.json (created on the
+    first run). Pass other options after ``--``, e.g. ``--select toml``."""
+    session.run("poetry", "install", "--with", "dev", external=True)
+    args = session.posargs or [
+        "--output",
+        ".benchmarks/latest.json",
+        "--baseline",
+        ".benchmarks/baseline.json",
+    ]
+    session.run("python", "benchmarks/suite.py", *args)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from configclasses import configclass
+from configclasses.aio import parse_path_async
+from configclasses.configclasses import parse_path
+
+
+@configclass
+class Section:
+    key_0: int
+    key_1: str
+
+
+@configclass
+class AppConfig:
+    section_0: Section
+    section_19: Section
+
+
+def write_config_dir(path, files=20, keys=300):
+    for file in range(files):
+        lines = [f"section_{file}:"]
+        lines += [f"  key_{key}: {file}" for key in range(keys)]
+        (path / f"{file:02}.yaml").write_text("\n".join(lines))
+    (path / "99.env").write_text("SECTION_19_KEY_1=overridden")
+
+
+def test_parse_path_async_matches_parse_path(tmp_path):
+    write_config_dir(tmp_path, files=3, keys=5)
+    assert asyncio.run(parse_path_async(tmp_path)) == parse_path(tmp_path)
+
+
+def test_from_path_async_accepts_max_workers(tmp_path):
+    write_config_dir(tmp_path, files=3, keys=5)
+    for max_workers in (1, 2):
+        cfg = asyncio.run(AppConfig.from_path_async(tmp_path, max_workers=max_workers))
+        assert cfg == AppConfig.from_path(tmp_path)
+
+
+def test_from_string_async():
+    cfg = asyncio.run(
+        AppConfig.from_string_async('{"section_0": {"key_0": 3}}', ".json")
+    )
+    assert cfg.section_0.key_0 == 3
+
+
+def test_event_loop_stays_responsive_while_loading(tmp_path):
+    write_config_dir(tmp_path)
+
+    async def main():
+        ticks = []
+        loading = asyncio.ensure_future(AppConfig.from_path_async(tmp_path))
+        while not loading.done():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0)
+        return await loading, ticks
+
+    start = time.perf_counter()
+    cfg, ticks = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+
+    assert cfg.section_0.key_0 == 0
+    assert cfg.section_19.key_0 == 19
+    assert cfg.section_19.key_1 == "overridden"
+    gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+    assert len(ticks) > 10
+    assert max(gaps) < elapsed / 2
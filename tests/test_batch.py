@@ -0,0 +1,74 @@
+import pytest
+
+from configclasses import configclass, load_many
+
+
+@configclass
+class DB:
+    host: str
+    port: int
+
+
+@configclass(prefix="DEFAULT")
+class TenantConfig:
+    db: DB
+    plan: str = "free"
+
+
+@pytest.fixture
+def tenants_file(tmp_path):
+    path = tmp_path / "tenants.toml"
+    path.write_text(
+        '[t1.db]\nhost = "db1"\nport = 1\n'
+        '[t2]\nplan = "pro"\n[t2.db]\nhost = "db2"\nport = 2\n'
+    )
+    return path
+
+
+def test_load_many_tenants(tenants_file):
+    t1, t2 = load_many(
+        [(TenantConfig, {"prefix": "T1"}), (TenantConfig, {"prefix": "T2"})],
+        sources=[tenants_file],
+        environ={},
+    )
+    assert t1 == TenantConfig(DB("db1", 1))
+    assert t2 == TenantConfig(DB("db2", 2), "pro")
+
+
+def test_load_many_with_defaults_and_environ(tenants_file):
+    (t1,) = load_many(
+        [(TenantConfig, {"prefix": "T1", "defaults": {"T1_PLAN": "trial"}})],
+        sources=[tenants_file],
+        environ={"T1_DB_PORT": "10"},
+    )
+    assert t1.plan == "trial"
+    # Upper-case env vars take precedence over the lower-case keys of files.
+    assert t1.db.port == 10
+
+
+def test_load_many_later_sources_take_precedence(tenants_file, tmp_path):
+    override = tmp_path / "override.env"
+    override.write_text("T1_DB_HOST=override")
+    t1, default = load_many(
+        [(TenantConfig, {"prefix": "T1"}), TenantConfig],
+        sources=[tenants_file, override],
+        environ={"DEFAULT_DB_HOST": "default"},
+    )
+    assert t1.db.host == "override"
+    assert default.db.host == "default"
+
+
+def test_load_many_in_threads(tenants_file):
+    requests = [(TenantConfig, {"prefix": f"T{i % 2 + 1}"}) for i in range(20)]
+    configs = load_many(requests, [tenants_file], environ={}, max_workers=4)
+    assert [config.db.port for config in configs] == [i % 2 + 1 for i in range(20)]
+
+
+def test_load_many_unknown_options():
+    with pytest.raises(TypeError):
+        load_many([(TenantConfig, {"prefx": "T1"})], environ={})
+
+
+def test_from_environ_prefix_override():
+    cfg = TenantConfig.from_environ(environ={"T3_DB_HOST": "db3"}, prefix="T3")
+    assert cfg.db.host == "db3"
@@ -0,0 +1,178 @@
+import os
+from dataclasses import field
+from typing import Dict, List
+
+import pytest
+
+from configclasses import configclass
+from configclasses.cache import FileCache, file_cache
+from configclasses.configclasses import parse_path
+
+
+@pytest.fixture
+def a_json_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"host": "localhost", "port": 8000}')
+    return path
+
+
+def parse(path):
+    return {"content": path.read_text()}
+
+
+def test_file_cache_hits_while_file_is_unchanged(a_json_file):
+    cache = FileCache()
+    first = cache.get(a_json_file, parse)
+    second = cache.get(a_json_file, parse)
+    assert first is second
+    assert cache.info().hits == 1
+    assert cache.info().misses == 1
+
+
+def test_file_cache_misses_when_file_changes(a_json_file):
+    cache = FileCache()
+    cache.get(a_json_file, parse)
+    a_json_file.write_text('{"host": "0.0.0.0"}')
+    stat = a_json_file.stat()
+    os.utime(a_json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(a_json_file, parse) == {"content": '{"host": "0.0.0.0"}'}
+    assert cache.info().misses == 2
+    assert cache.info().entries == 1
+
+
+def test_file_cache_invalidate(a_json_file):
+    cache = FileCache()
+    cache.get(a_json_file, parse)
+    cache.invalidate(a_json_file)
+    assert cache.info().entries == 0
+    cache.get(a_json_file, parse)
+    cache.invalidate()
+    assert cache.info().entries == 0
+    assert cache.info().bytes == 0
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path):
+    cache = FileCache(max_entries=2)
+    paths = [tmp_path / f"{name}.env" for name in "abc"]
+    for path in paths:
+        path.write_text("A=1")
+        cache.get(path, parse)
+    cache.get(paths[0], parse)
+    assert cache.info().entries == 2
+    assert cache.info().misses == 4
+
+
+def test_file_cache_max_bytes(a_json_file):
+    cache = FileCache(max_bytes=1)
+    cache.get(a_json_file, parse)
+    assert cache.info().entries == 0
+
+
+def test_from_path_uses_file_cache(a_configclass):
+    file_cache.invalidate()
+    before = file_cache.info()
+    a_configclass.from_path("tests/test_files/configclass.json")
+    cfg = a_configclass.from_path("tests/test_files/configclass.json")
+    after = file_cache.info()
+    assert cfg.db.port == 321
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
+
+def test_parse_path_parses_only_misses_in_a_pool(tmp_path, monkeypatch):
+    import concurrent.futures
+
+    for number in range(3):
+        (tmp_path / f"{number}.json").write_text(f'{{"key_{number}": {number}}}')
+    expected = {"key_0": "0", "key_1": "1", "key_2": "2"}
+    assert parse_path(tmp_path) == expected
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("cache hits must not start a thread pool")
+
+    monkeypatch.setattr(concurrent.futures, "ThreadPoolExecutor", no_pool)
+    before = file_cache.info()
+    assert parse_path(tmp_path) == expected
+    assert file_cache.info().hits - before.hits == 3
+    (tmp_path / "1.json").write_text('{"key_1": 10}')
+    assert parse_path(tmp_path)["key_1"] == "10"
+
+
+@pytest.fixture
+def a_cached_configclass():
+    @configclass(frozen=True)
+    class DB:
+        host: str
+        port: int
+
+    @configclass(prefix="CACHED", frozen=True, cache=True, cache_size=2)
+    class AppConfig:
+        db: DB
+        debug: bool = False
+
+    return AppConfig
+
+
+def test_cached_from_environ_returns_same_instance(a_cached_configclass, monkeypatch):
+    monkeypatch.setenv("CACHED_DB_HOST", "localhost")
+    monkeypatch.setenv("cached_db_port", "5432")
+    first = a_cached_configclass.from_environ()
+    assert first is a_cached_configclass.from_environ()
+    assert first.db.port == 5432
+    assert a_cached_configclass.cache_info().hits == 1
+
+    monkeypatch.setenv("CACHED_DB_PORT", "6543")
+    second = a_cached_configclass.from_environ()
+    assert second is not first
+    assert second.db.port == 6543
+
+
+def test_cached_from_environ_keys_on_defaults(a_cached_configclass):
+    first = a_cached_configclass.from_environ({"cached_debug": "true"})
+    assert first is a_cached_configclass.from_environ({"cached_debug": "true"})
+    assert first is not a_cached_configclass.from_environ({"cached_debug": "false"})
+    assert a_cached_configclass.cache_info().currsize == 2
+
+
+def test_cached_from_environ_bypassed_with_explicit_environ(a_cached_configclass):
+    environ = {"CACHED_DB_PORT": "1"}
+    first = a_cached_configclass.from_environ(environ=environ)
+    assert first is not a_cached_configclass.from_environ(environ=environ)
+
+
+def test_cache_clear(a_cached_configclass):
+    first = a_cached_configclass.from_environ()
+    a_cached_configclass.cache_clear()
+    assert a_cached_configclass.cache_info().currsize == 0
+    assert first is not a_cached_configclass.from_environ()
+
+
+def test_cached_from_environ_tracks_mapping_fields(monkeypatch):
+    @configclass(prefix="FLAGS", frozen=True, cache=True)
+    class Flags:
+        enabled: Dict[str, bool] = field(default_factory=dict)
+
+    monkeypatch.setenv("FLAGS_ENABLED_SEARCH", "true")
+    first = Flags.from_environ()
+    assert first is Flags.from_environ()
+
+    monkeypatch.setenv("FLAGS_ENABLED_BETA", "true")
+    assert Flags.from_environ().enabled == {"search": True, "beta": True}
+
+
+def test_cached_from_environ_tracks_every_list_item(monkeypatch):
+    @configclass(prefix="APP", frozen=True, cache=True)
+    class Hosts:
+        hosts: List[str] = field(default_factory=list)
+
+    monkeypatch.setenv("APP_HOSTS_0", "a")
+    monkeypatch.setenv("APP_HOSTS_1", "b")
+    assert Hosts.from_environ() is Hosts.from_environ()
+
+    monkeypatch.setenv("APP_HOSTS_1", "c")
+    assert Hosts.from_environ().hosts == ["a", "c"]
+
+
+def test_cache_requires_frozen():
+    with pytest.raises(ValueError):
+        configclass(cache=True)
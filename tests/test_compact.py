@@ -0,0 +1,84 @@
+import gc
+import sys
+import tracemalloc
+
+import pytest
+
+from configclasses import configclass
+from configclasses.configclasses import dump
+
+TENANTS = 10_000
+
+
+def make_classes(compact: bool):
+    @configclass(frozen=True, compact=compact)
+    class DB:
+        host: str
+        port: int
+        name: str
+
+    @configclass(frozen=True, compact=compact)
+    class TenantConfig:
+        name: str
+        db: DB
+        plan: str
+        region: str
+
+    return TenantConfig
+
+
+def load_tenants(tenant_class):
+    environ = {
+        "DB_HOST": "db.internal",
+        "DB_PORT": "5432",
+        "DB_NAME": "app",
+        "REGION": "eu-west",
+    }
+    tenants = []
+    for number in range(TENANTS):
+        # Fresh strings for every tenant, as if read from a new env snapshot.
+        values = {key: "".join(list(value)) for key, value in environ.items()}
+        values["NAME"] = f"tenant-{number}"
+        values["PLAN"] = "".join(list(("free", "pro")[number % 2]))
+        tenants.append(tenant_class.from_environ(environ=values))
+    return tenants
+
+
+def memory_per_tenant(tenant_class) -> float:
+    load_tenants(tenant_class)  # compile plans and warm caches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tenants = load_tenants(tenant_class)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(tenants) == TENANTS
+    return size / TENANTS
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slots need Python 3.10")
+def test_compact_instances_use_less_memory():
+    regular = memory_per_tenant(make_classes(compact=False))
+    compact = memory_per_tenant(make_classes(compact=True))
+    assert compact < regular * 0.75
+
+
+def test_compact_instances_share_sub_configs():
+    tenant_class = make_classes(compact=True)
+    first, second = load_tenants(tenant_class)[:2]
+    assert first is not second
+    assert first.db is second.db
+    assert first.region is second.region
+    assert first.plan != second.plan
+    if sys.version_info >= (3, 10):
+        assert not hasattr(first, "__dict__")
+
+
+def test_compact_instances_dump():
+    tenant_class = make_classes(compact=True)
+    tenant = load_tenants(tenant_class)[0]
+    assert dump(tenant, extension=".json") == (
+        b'{"name": "tenant-0", "db": {"host": "db.internal", "port": 5432, "name": "app"}, '
+        b'"plan": "free", "region": "eu-west"}'
+    )
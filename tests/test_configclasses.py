@@ -1,10 +1,16 @@
 import os
+from dataclasses import field
 from pathlib import Path
+from typing import Dict
 
 import pytest
 
 from configclasses import configclass
-from configclasses.exceptions import ConfigFilePathDoesNotExist
+from configclasses.configclasses import list_config_files, parse_path
+from configclasses.exceptions import ConfigFilePathDoesNotExist, NonSupportedExtension
+from configclasses.helpers import environ_index
+from configclasses.plan import compile_plan
+from configclasses.sources import build_index
 
 
 def test_path_to_env_inexistent_path(a_configclass):
@@ -12,24 +18,26 @@ def test_path_to_env_inexistent_path(a_configclass):
         a_configclass.from_path(Path("nothing"))
 
 
-def test_path_to_env_if_path_is_a_toml_file(a_configclass):
-    a_configclass.from_path(Path("tests/test_files/configclass.toml"))
-    assert os.environ["db_driver"] == "postgres"
+def test_path_to_env_if_path_is_a_toml_file(a_configclass, monkeypatch):
+    monkeypatch.delenv("db_driver", raising=False)
+    cfg = a_configclass.from_path(Path("tests/test_files/configclass.toml"))
+    assert cfg.db.driver == "postgres"
+    assert "db_driver" not in os.environ
 
 
 def test_path_to_env_if_path_is_a_yaml_file(a_configclass):
-    a_configclass.from_path(Path("tests/test_files/configclass.yaml"))
-    assert os.environ["db_driver"] == "mongodb"
+    cfg = a_configclass.from_path(Path("tests/test_files/configclass.yaml"))
+    assert cfg.db.driver == "mongodb"
 
 
 def test_path_to_env_if_path_is_a_ini_file(a_configclass):
-    a_configclass.from_path(Path("tests/test_files/configclass.ini"))
-    assert os.environ["db_user"] == "pain"
+    cfg = a_configclass.from_path(Path("tests/test_files/configclass.ini"))
+    assert cfg.db.user == "pain"
 
 
 def test_path_to_env_if_path_is_a_json_file(a_configclass):
-    a_configclass.from_path(Path("tests/test_files/configclass.json"))
-    assert os.environ["db_port"] == "321"
+    cfg = a_configclass.from_path(Path("tests/test_files/configclass.json"))
+    assert cfg.db.port == 321
 
 
 def test_path_to_env_if_path_is_a_json_string(a_configclass):
@@ -44,30 +52,61 @@ def test_path_to_env_if_path_is_a_json_string(a_configclass):
         "password": "pass"
       }
     }"""
-    a_configclass.from_string(test_json, ".json")
-    assert os.environ["db_password"] == "pass"
+    cfg = a_configclass.from_string(test_json, ".json")
+    assert cfg.db.password == "pass"
 
 
 def test_path_to_env_if_path_is_a_dir(a_configclass):
     configclass_path = Path("tests") / "test_files" / "configclass_path"
-    a_configclass.from_path(configclass_path)
+    cfg = a_configclass.from_path(configclass_path)
+    assert cfg.db.host == "192.168.1.11"
+
+
+def test_from_path_export_writes_os_environ(a_configclass, monkeypatch):
+    monkeypatch.setenv("DB_HOST", "from-environ")
+    configclass_path = Path("tests") / "test_files" / "configclass_path"
+    for key, value in parse_path(configclass_path).items():
+        # Lets monkeypatch undo the export once the test is done.
+        monkeypatch.setenv(key, os.environ.get(key, value))
+    a_configclass.from_path(configclass_path, export=True)
     assert os.environ["DB_HOST"] == "192.168.1.11"
 
 
-def test_from_environ(a_configclass):
-    os.environ["DEFAULT_PRICE"] = "22"
-    os.environ["ONLY_PUB"] = "True"
-    os.environ.pop("DB_USER", None)
-    os.environ.pop("db_user", None)
+def test_file_values_override_environ(a_configclass, monkeypatch):
+    monkeypatch.setenv("DB_HOST", "from-environ")
+    configclass_path = Path("tests") / "test_files" / "configclass_path"
+    cfg = a_configclass.from_path(configclass_path)
+    assert cfg.db.host == "192.168.1.11"
+    assert os.environ["DB_HOST"] == "from-environ"
+
+
+def test_upper_case_environ_beats_lower_case_file_keys(monkeypatch):
+    @configclass
+    class Server:
+        port: int
+
+    monkeypatch.setenv("PORT", "1")
+    assert Server.from_string("port = 2", ".toml").port == 1
+    assert Server.from_string("port = 2", ".toml", export=True).port == 1
+    # An upper-case key in the file is as specific as the env var and wins.
+    assert Server.from_string("PORT=3", ".env").port == 3
+    assert Server.from_string("PORT=3", ".env", export=True).port == 3
+
+
+def test_from_environ(a_configclass, monkeypatch):
+    monkeypatch.setenv("DEFAULT_PRICE", "22")
+    monkeypatch.setenv("ONLY_PUB", "True")
+    monkeypatch.delenv("DB_USER", raising=False)
+    monkeypatch.delenv("db_user", raising=False)
     cfg = a_configclass.from_environ({"db_driver": "mssql", "db_user": "matt"})
     assert cfg.default_price == 22
     assert cfg.only_pub is True
     assert cfg.db.user == "matt"
 
 
-def test_prefix_parameter_works(a_configclass_with_prefix):
-    os.environ["APP_DB_HOST"] = "localhost"
-    os.environ["APP_DB_PORT"] = "8432"
+def test_prefix_parameter_works(a_configclass_with_prefix, monkeypatch):
+    monkeypatch.setenv("APP_DB_HOST", "localhost")
+    monkeypatch.setenv("APP_DB_PORT", "8432")
     cfg = a_configclass_with_prefix.from_environ(
         {"app_db_driver": "postgres", "APP_DB_USER": "katie"}
     )
@@ -106,3 +145,165 @@ def test_readme_example_from_string():
     app_config = AppConfig.from_string(test_env, ".env")
     assert app_config.port == 8000
     assert app_config.db.url == "sqlite://:memory:"
+
+
+def test_from_environ_uses_default_factory(monkeypatch):
+    @configclass
+    class AppConfig:
+        hosts: list = field(default_factory=list)
+        name: str = "app"
+
+    monkeypatch.delenv("HOSTS", raising=False)
+    monkeypatch.delenv("NAME", raising=False)
+    cfg = AppConfig.from_environ()
+    assert cfg.hosts == []
+    assert cfg.name == "app"
+
+
+def test_load_plan_resolves_nested_keys_once(a_configclass_with_prefix):
+    plan = compile_plan(a_configclass_with_prefix, "APP")
+    db_step = plan.steps[0]
+    assert db_step.plan is not None
+    assert [step.key for step in db_step.plan.steps] == [
+        "app_db_driver",
+        "app_db_host",
+        "app_db_port",
+        "app_db_user",
+        "app_db_password",
+    ]
+    assert db_step.plan.steps[2].converter is int
+
+
+def test_from_environ_keeps_falsy_values(monkeypatch):
+    @configclass
+    class AppConfig:
+        port: int
+        host: str
+
+    monkeypatch.setenv("PORT", "0")
+    monkeypatch.setenv("HOST", "")
+    cfg = AppConfig.from_environ({"port": "8000", "host": "localhost"})
+    assert cfg.port == 0
+    assert cfg.host == ""
+
+
+def test_from_environ_with_explicit_mapping(a_configclass_with_prefix):
+    cfg = a_configclass_with_prefix.from_environ(
+        {"APP_DB_PORT": "1"},
+        environ={"app_db_host": "db", "APP_DB_HOST": "upper-db", "APP_db_user": "me"},
+    )
+    assert cfg.db.host == "upper-db"
+    assert cfg.db.user == "me"
+    assert cfg.db.port == 1
+
+
+@pytest.fixture
+def a_layered_config_dir(tmp_path):
+    (tmp_path / "secrets").mkdir()
+    (tmp_path / "secrets" / "db.env").write_text("DB_PASSWORD=secret\nDB_HOST=secrets")
+    (tmp_path / "base.toml").write_text('default_price = 1\n[db]\nhost = "base"')
+    (tmp_path / "production.json").write_text('{"db": {"host": "production"}}')
+    (tmp_path / "README.md").write_text("Not a config file")
+    return tmp_path
+
+
+def test_parse_path_merges_files_in_lexical_order(a_layered_config_dir):
+    assert [file.name for file in list_config_files(a_layered_config_dir)] == [
+        "base.toml",
+        "production.json",
+        "db.env",
+    ]
+    assert parse_path(a_layered_config_dir)["DB_HOST"] == "secrets"
+
+
+def test_parse_path_with_explicit_order(a_layered_config_dir):
+    values = parse_path(
+        a_layered_config_dir, order=["secrets/*", "production.json"], max_workers=2
+    )
+    assert values["db_host"] == "production"
+    assert values["DB_PASSWORD"] == "secret"
+
+
+def test_parse_path_with_pattern_and_exclude(a_layered_config_dir):
+    assert [
+        file.name
+        for file in list_config_files(
+            a_layered_config_dir, pattern="*", exclude=["*.json"]
+        )
+    ] == ["base.toml"]
+
+
+def test_from_path_with_path_options(a_configclass, a_layered_config_dir):
+    cfg = a_configclass.from_path(
+        a_layered_config_dir, exclude=["secrets/*"], order=["base.toml"]
+    )
+    assert cfg.db.host == "base"
+    assert cfg.default_price == 1
+
+
+def test_path_to_env_non_supported_extension(tmp_path):
+    config_file = tmp_path / "config.xml"
+    config_file.write_text("<config/>")
+    with pytest.raises(NonSupportedExtension):
+        parse_path(config_file)
+
+
+def test_index_scan_by_prefix():
+    index = build_index(
+        {"APP_FEATURE_SEARCH": "on", "app_feature_beta": "off", "APP_FEATURES": "x"}
+    )
+    assert index.scan("APP_FEATURE_") == {
+        "app_feature_search": "on",
+        "app_feature_beta": "off",
+    }
+    assert index.scan("OTHER_") == {}
+
+
+def test_environ_index_reads_os_environ_on_demand(monkeypatch):
+    monkeypatch.setenv("ONDEMAND_HOST", "upper")
+    monkeypatch.setenv("ondemand_host", "lower")
+    monkeypatch.setenv("ondemand_port", "8000")
+    monkeypatch.setenv("ONDEMAND_FEATURE_SEARCH", "on")
+    index = build_index(defaults={"ONDEMAND_PORT": "1", "ONDEMAND_USER": "app"})
+
+    assert index.get("ondemand_host") == "upper"
+    assert index.get("ondemand_port") == "8000"
+    assert index.get("ondemand_user") == "app"
+    assert index.get("ondemand_missing") is None
+    assert index.scan("ONDEMAND_FEATURE_") == {"ondemand_feature_search": "on"}
+
+
+def test_environ_index_is_reused_until_environ_changes(monkeypatch):
+    monkeypatch.setenv("REUSED_FEATURE_SEARCH", "on")
+    index = environ_index()
+    assert environ_index() is index
+    assert index.scan("REUSED_FEATURE_") == {"reused_feature_search": "on"}
+
+    monkeypatch.setenv("REUSED_FEATURE_BETA", "off")
+    assert environ_index() is not index
+    assert build_index().scan("REUSED_FEATURE_") == {
+        "reused_feature_search": "on",
+        "reused_feature_beta": "off",
+    }
+    monkeypatch.setenv("REUSED_FEATURE_BETA", "on")
+    assert build_index().scan("REUSED_FEATURE_")["reused_feature_beta"] == "on"
+
+
+def test_mapping_field_filled_from_prefixed_keys(tmp_path):
+    @configclass(prefix="APP")
+    class AppConfig:
+        feature: Dict[str, bool]
+        limits: Dict[str, int] = field(default_factory=dict)
+
+    config = AppConfig.from_environ(
+        environ={"APP_FEATURE_SEARCH": "true", "APP_FEATURE_BETA": "false"}
+    )
+    assert config == AppConfig({"search": True, "beta": False}, {})
+
+    config = AppConfig.from_environ(environ={"APP_FEATURE": "search=true"})
+    assert config.feature == {"search": True}
+
+    path = tmp_path / "app.toml"
+    path.write_text("[app.feature]\nsearch = true\n[app.limits]\nusers = 10\n")
+    config = AppConfig.from_path(path)
+    assert config == AppConfig({"search": True}, {"users": 10})
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytest
+
+from configclasses import configclass
+from configclasses.converters import compile_converter, register_converter, to_bool
+from configclasses.exceptions import ConversionError, ValidationError
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Level(Enum):
+    LOW = 1
+    HIGH = 2
+
+
+class Host(str):
+    pass
+
+
+@configclass
+class Typed:
+    color: Color
+    level: Level
+    started: datetime
+    day: date
+    timeout: timedelta
+    path: Path
+    price: Decimal
+    ports: List[int]
+    pair: Tuple[str, int]
+    limits: Dict[str, float]
+    retries: Optional[int] = None
+    id: Union[int, str] = 0
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("True", True), ("yes", True), ("1", True), ("off", False), ("False", False)],
+)
+def test_to_bool(value, expected):
+    assert to_bool(value) is expected
+
+
+def test_to_bool_rejects_unknown_values():
+    with pytest.raises(ValueError):
+        to_bool("maybe")
+
+
+def test_compile_converter_identity_for_str():
+    assert compile_converter(str) is None
+
+
+def test_compile_converter_timedelta():
+    converter = compile_converter(timedelta)
+    assert converter("90") == timedelta(seconds=90)
+    assert converter("1 day, 01:30") == timedelta(days=1, hours=1, minutes=30)
+
+
+def test_compile_converter_collections():
+    assert compile_converter(List[int])("1, 2,3") == [1, 2, 3]
+    assert compile_converter(List[int])("[1, 2]") == [1, 2]
+    assert compile_converter(list)("a,b") == ["a", "b"]
+    assert compile_converter(List[List[int]])("[[1], [2, 3]]") == [[1], [2, 3]]
+    assert compile_converter(Dict[str, int])("a=1, b=2") == {"a": 1, "b": 2}
+    assert compile_converter(Dict[str, bool])('{"a": true}') == {"a": True}
+
+
+def test_from_environ_converts_annotated_types():
+    cfg = Typed.from_environ(
+        environ={
+            "COLOR": "blue",
+            "LEVEL": "2",
+            "STARTED": "2024-01-02T03:04:05Z",
+            "DAY": "2024-01-02",
+            "TIMEOUT": "1.5",
+            "PATH": "/tmp/app",
+            "PRICE": "1.10",
+            "PORTS": "80,443",
+            "PAIR": "a,1",
+            "LIMITS": '{"cpu": 1.5}',
+            "RETRIES": "3",
+            "ID": "abc",
+        }
+    )
+    assert cfg.color is Color.BLUE
+    assert cfg.level is Level.HIGH
+    assert cfg.started == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert cfg.day == date(2024, 1, 2)
+    assert cfg.timeout == timedelta(seconds=1.5)
+    assert cfg.path == Path("/tmp/app")
+    assert cfg.price == Decimal("1.10")
+    assert cfg.ports == [80, 443]
+    assert cfg.pair == ("a", 1)
+    assert cfg.limits == {"cpu": 1.5}
+    assert cfg.retries == 3
+    assert cfg.id == "abc"
+
+
+def test_optional_empty_value_is_none():
+    @configclass
+    class AppConfig:
+        retries: Optional[int] = 3
+
+    assert AppConfig.from_environ(environ={"RETRIES": ""}).retries is None
+
+
+def test_lists_from_config_files():
+    @configclass
+    class AppConfig:
+        hosts: List[str]
+        ports: List[int]
+
+    cfg = AppConfig.from_string('{"hosts": ["a", "b"], "ports": [80, 443]}', ".json")
+    assert cfg.hosts == ["a", "b"]
+    assert cfg.ports == [80, 443]
+
+
+def test_conversion_errors_report_the_env_key():
+    @configclass(prefix="APP")
+    class AppConfig:
+        port: int
+
+    with pytest.raises(ConversionError, match="app_port") as error:
+        AppConfig.from_environ(environ={"APP_PORT": "http"})
+    assert error.value.key == "app_port"
+    assert isinstance(error.value, ValueError)
+
+
+def test_invalid_decimal_and_timedelta_are_reported_together():
+    @configclass
+    class AppConfig:
+        price: Decimal
+        timeout: timedelta
+
+    with pytest.raises(ValidationError) as error:
+        AppConfig.from_environ(environ={"PRICE": "abc", "TIMEOUT": "1e20"})
+    assert [e.key for e in error.value.errors] == ["price", "timeout"]
+    assert all(isinstance(e.error, ValueError) for e in error.value.errors)
+
+
+def test_register_converter():
+    register_converter(Host, lambda value: Host(value.lower()))
+
+    @configclass
+    class AppConfig:
+        host: Host
+
+    assert AppConfig.from_environ(environ={"HOST": "LOCALHOST"}).host == "localhost"
@@ -1,7 +1,23 @@
+import os
+import sys
+from enum import Enum
+from io import StringIO
 from pathlib import Path
+from typing import List
+
+import pytest
 
 from configclasses import configclass
-from configclasses.dumpers import dump_env, dump_json
+from configclasses.configclasses import dump, parse_file
+from configclasses.dumpers import dump_env, dump_json, dump_toml, write_if_changed
+from configclasses.formats import get_format
+
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
 
 
 def test_dump_env(another_configclass):
@@ -42,3 +58,144 @@ def test_dump_json(another_configclass):
     assert app_config == app_config_copy
 
     test_file.unlink()
+
+
+@pytest.fixture
+def a_typed_configclass():
+    @configclass(frozen=True, **SLOTS)
+    class Pool:
+        size: int
+        timeout: float
+
+    @configclass(frozen=True, **SLOTS)
+    class DB:
+        url: str
+        pool: Pool
+        replicas: List[str]
+
+    @configclass(frozen=True, **SLOTS)
+    class AppConfig:
+        host: str
+        db: DB
+        port: int
+        debug: bool
+        color: Color
+        motd: str = 'Say "hi" # now'
+
+    return AppConfig(
+        "0.0.0.0",
+        DB("postgres://db", Pool(5, 1.5), ["r1", "r2"]),
+        8000,
+        True,
+        Color.BLUE,
+    )
+
+
+@pytest.mark.parametrize("extension", [".env", ".toml", ".yaml", ".ini", ".json"])
+def test_dump_roundtrip(a_typed_configclass, extension):
+    dumped = dump(a_typed_configclass, extension=extension)
+    assert isinstance(dumped, bytes)
+    values = parse_file(string=dumped.decode(), extension=extension)
+    loaded = type(a_typed_configclass).from_environ(environ=values)
+    assert loaded == a_typed_configclass
+
+
+@pytest.mark.parametrize("extension", [".env", ".toml", ".yaml", ".ini", ".json"])
+def test_dump_to_path_and_file_object(a_typed_configclass, extension, tmp_path):
+    path = tmp_path / f"config{extension}"
+    assert dump(a_typed_configclass, path) is True
+    stream = StringIO()
+    get_format(extension).dump(a_typed_configclass, stream)
+    assert stream.getvalue() == path.read_text()
+
+
+def test_dump_toml_tables(a_typed_configclass):
+    assert dump_toml(a_typed_configclass) == (
+        'host = "0.0.0.0"\n'
+        "port = 8000\n"
+        "debug = true\n"
+        'color = "blue"\n'
+        'motd = "Say \\"hi\\" # now"\n'
+        "\n"
+        "[db]\n"
+        'url = "postgres://db"\n'
+        'replicas = ["r1", "r2"]\n'
+        "\n"
+        "[db.pool]\n"
+        "size = 5\n"
+        "timeout = 1.5\n"
+    )
+
+
+def test_dump_env_quotes_values(another_configclass):
+    app_config = another_configclass.from_environ(
+        environ={"HOST": "multi\nline", "DB_URL": "a b"}
+    )
+    dumped = dump_env(app_config)
+    assert 'host="multi\\nline"\n' in dumped
+    assert 'db_url="a b"\n' in dumped
+    values = parse_file(string=dumped, extension=".env")
+    assert another_configclass.from_environ(environ=values) == app_config
+
+
+def test_dump_env_keeps_dollar_signs(another_configclass):
+    app_config = another_configclass.from_environ(
+        environ={"HOST": "${HOME}", "DB_URL": "it's\n$HOME \\ ${X:-y}"}
+    )
+    dumped = dump_env(app_config)
+    assert "host='${HOME}'\n" in dumped
+    values = parse_file(string=dumped, extension=".env")
+    assert another_configclass.from_environ(environ=values) == app_config
+
+
+@pytest.mark.parametrize("extension", [".env", ".ini"])
+def test_dump_to_path_is_utf8(another_configclass, extension, tmp_path):
+    app_config = another_configclass.from_environ(
+        environ={"HOST": "ünïcode", "DB_PASSWORD": "pässwörd"}
+    )
+    path = tmp_path / f"config{extension}"
+    get_format(extension).dump(app_config, path)
+    assert path.read_bytes() == dump(app_config, extension=extension)
+    assert another_configclass.from_environ(environ=parse_file(path)) == app_config
+
+
+def test_dump_skips_unchanged_files(a_typed_configclass, tmp_path):
+    path = tmp_path / "config.toml"
+    assert dump(a_typed_configclass, path) is True
+    stat = path.stat()
+    assert dump(a_typed_configclass, path) is False
+    assert path.stat().st_mtime_ns == stat.st_mtime_ns
+    assert path.stat().st_ino == stat.st_ino
+
+
+def test_dump_replaces_changed_files_atomically(a_typed_configclass, tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    path.chmod(0o640)
+    assert dump(a_typed_configclass, path) is True
+    assert path.read_bytes() == dump(a_typed_configclass, extension=".json")
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert [file.name for file in tmp_path.iterdir()] == ["config.json"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="no os.fchmod")
+def test_write_if_changed_keeps_group_writable_mode(tmp_path):
+    path = tmp_path / "config.env"
+    path.write_text("A=0\n")
+    path.chmod(0o664)
+    umask = os.umask(0o022)
+    try:
+        assert write_if_changed(path, b"A=1\n") is True
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o664
+
+
+def test_write_if_changed_cleans_up_on_errors(tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", fail)
+    with pytest.raises(OSError):
+        write_if_changed(tmp_path / "config.env", b"A=1\n")
+    assert list(tmp_path.iterdir()) == []
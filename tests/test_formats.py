@@ -0,0 +1,95 @@
+import pytest
+
+from configclasses import configclass
+from configclasses.configclasses import dump
+from configclasses.exceptions import NonSupportedExtension
+from configclasses.formats import (
+    FormatBackend,
+    _backends,
+    get_format,
+    register_format,
+    supported_extensions,
+)
+from configclasses.loaders import get_yaml_parser
+
+
+@configclass
+class ClientConfig:
+    host: str
+    port: int
+
+
+def parse_properties(path=None, string=None):
+    text = path.read_text() if path else string
+    return dict(line.split(":", 1) for line in text.splitlines() if line)
+
+
+@pytest.fixture
+def properties_format():
+    backend = register_format("properties", (".properties",), parse_properties)
+    yield backend
+    del _backends[".properties"]
+
+
+def test_builtin_formats_are_registered():
+    assert set(supported_extensions()) >= {
+        ".env",
+        ".toml",
+        ".yaml",
+        ".yml",
+        ".ini",
+        ".cfg",
+        ".json",
+    }
+    assert get_format(".yml") is get_format(".yaml")
+
+
+def test_unknown_extension():
+    with pytest.raises(NonSupportedExtension):
+        get_format(".xml")
+
+
+def test_registered_format_is_used_by_loaders(properties_format, tmp_path):
+    cfg = ClientConfig.from_string("host:localhost\nport:8000", ".properties")
+    assert cfg.port == 8000
+
+    config_file = tmp_path / "client.properties"
+    config_file.write_text("host:0.0.0.0\nport:80")
+    assert ClientConfig.from_path(config_file).host == "0.0.0.0"
+
+
+def test_dump_without_dumper(properties_format, tmp_path):
+    with pytest.raises(NonSupportedExtension):
+        dump(ClientConfig("localhost", 80), tmp_path / "client.properties")
+
+
+def dump_properties(obj, path):
+    text = f"host:{obj.host}\nport:{obj.port}\n"
+    if path is None:
+        return text
+    path.write_text(text)
+
+
+def test_dump_with_registered_dumper(tmp_path):
+    register_format("properties", (".properties",), parse_properties, dump_properties)
+    try:
+        config_file = tmp_path / "client.properties"
+        assert dump(ClientConfig("localhost", 80), config_file) is True
+        assert config_file.read_text() == "host:localhost\nport:80\n"
+        assert ClientConfig.from_path(config_file) == ClientConfig("localhost", 80)
+    finally:
+        del _backends[".properties"]
+
+
+def test_backends_are_resolved_lazily():
+    backend = FormatBackend(
+        "lazy", (".lazy",), "tests.test_formats:parse_properties", None
+    )
+    assert backend._loader == "tests.test_formats:parse_properties"
+    assert backend.load(string="a:1") == {"a": "1"}
+    assert backend._loader is parse_properties
+
+
+def test_yaml_parser_uses_safe_loader():
+    with pytest.raises(Exception):
+        get_yaml_parser()("!!python/object/apply:os.getcwd []")
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+# Modules that must only be imported once the feature using them is.
+DEFERRED_MODULES = {
+    "concurrent.futures",
+    "configparser",
+    "configclasses.aio",
+    "configclasses.batch",
+    "configclasses.dumpers",
+    "configclasses.loaders",
+    "configclasses.rebuild",
+    "configclasses.watch",
+    "dotenv",
+    "hashlib",
+    "inspect",
+    "json",
+    "tomlkit",
+    "tomllib",
+    "yaml",
+}
+
+
+def imported_modules(code: str) -> set:
+    """Modules imported by running ``code`` in a new interpreter, as reported by
+    ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_import_defers_heavy_modules():
+    modules = imported_modules(
+        "import dataclasses, inspect\n"  # dataclasses itself imports inspect
+        "from configclasses import configclass\n"
+        "@configclass\n"
+        "class AppConfig:\n"
+        "    port: int = 80\n"
+        "AppConfig.from_environ()"
+    )
+    assert "configclasses.configclasses" in modules
+    assert not modules & (DEFERRED_MODULES - {"inspect"})
+
+
+def test_import_of_submodule_does_not_load_package():
+    modules = imported_modules("import configclasses.helpers")
+    assert "configclasses.configclasses" not in modules
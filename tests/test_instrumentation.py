@@ -0,0 +1,63 @@
+import pytest
+
+from configclasses import configclass
+from configclasses.cache import file_cache
+from configclasses.instrumentation import StatsCollector, add_hook, remove_hook
+
+
+@configclass
+class DB:
+    host: str
+    port: int
+
+
+@configclass(prefix="MEASURED")
+class AppConfig:
+    db: DB
+    debug: bool = False
+
+
+@pytest.fixture
+def stats():
+    collector = add_hook(StatsCollector())
+    yield collector
+    remove_hook(collector)
+
+
+def test_stats_of_from_path(tmp_path, stats):
+    path = tmp_path / "app.toml"
+    path.write_text('[measured.db]\nhost = "localhost"\nport = 5432\n')
+    file_cache.invalidate(path)
+
+    AppConfig.from_path(path)
+    AppConfig.from_path(path)
+
+    result = stats.as_dict()
+    assert result["counters"] == {
+        "files_parsed": 1,
+        "bytes_read": path.stat().st_size,
+        "cache_hits": 1,
+        "lookups": 6,
+    }
+    file_phases = result["phases"][str(path)]
+    assert set(file_phases) == {"read", "parse", "cache_hit"}
+    class_phases = result["phases"]["AppConfig"]
+    assert set(class_phases) == {"load", "index", "fill", "convert"}
+    assert class_phases["load"]["count"] == 2
+    assert class_phases["fill"]["total"] <= class_phases["load"]["total"]
+
+
+def test_hooks_receive_events():
+    events = []
+    add_hook(events.append)
+    try:
+        AppConfig.from_environ(
+            environ={"MEASURED_DB_HOST": "h", "MEASURED_DB_PORT": "1"}
+        )
+    finally:
+        remove_hook(events.append)
+    assert [event.phase for event in events] == ["index", "fill", "convert"]
+    assert events[1].cls is AppConfig
+
+    AppConfig.from_environ(environ={"MEASURED_DB_HOST": "h", "MEASURED_DB_PORT": "1"})
+    assert len(events) == 3
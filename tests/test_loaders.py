@@ -4,6 +4,8 @@ from pathlib import Path
 from configclasses.configclasses import file_to_env
 from configclasses.helpers import normalize_field_name
 from configclasses.loaders import (
+    flatten_dict,
+    iter_flat_items,
     load_dict,
     load_env,
     load_ini,
@@ -35,6 +37,26 @@ def test_load_dict():
     assert os.environ["a_string"] == "k3k3"
 
 
+def test_flatten_dict_nested_and_lists():
+    document = {
+        "A": {"B": {"C": 1}, "d": [1, {"E": "x"}]},
+        "flags": [],
+        "F": 2.5,
+    }
+    assert flatten_dict(document) == {
+        "a_b_c": "1",
+        "a_d_0": "1",
+        "a_d_1_e": "x",
+        "f": "2.5",
+    }
+
+
+def test_iter_flat_items_is_lazy():
+    items = iter_flat_items({"a": 1, "b": {"c": 2}})
+    assert next(items) == ("a", "1")
+    assert list(items) == [("b_c", "2")]
+
+
 def test_load_toml():
     load_toml(Path("tests/test_files/test.toml"))
     assert os.environ["outer_int"] == "1"
@@ -0,0 +1,68 @@
+import pytest
+
+from configclasses import configclass
+from configclasses.provenance import Origin, record_provenance
+
+
+@configclass
+class DB:
+    host: str
+    port: int = 5432
+
+
+@configclass(prefix="TRACED")
+class AppConfig:
+    db: DB
+    debug: bool = False
+    workers: int = 1
+
+
+def test_provenance_of_every_source(tmp_path, monkeypatch):
+    (tmp_path / "a.env").write_text("# base\nTRACED_DB_HOST=localhost\n")
+    (tmp_path / "b.toml").write_text("[traced]\ndebug = true\n")
+    monkeypatch.setenv("TRACED_DEBUG", "false")
+
+    with record_provenance() as provenance:
+        config = AppConfig.from_path(tmp_path, defaults={"TRACED_WORKERS": "4"})
+
+    # The upper-case TRACED_DEBUG env var beats the toml's lower-case key.
+    assert config == AppConfig(DB("localhost"), False, 4)
+    assert provenance.explain(config) == {
+        "db.host": Origin("file", str(tmp_path / "a.env"), 2, "localhost"),
+        "db.port": Origin("default", None, None, None),
+        "debug": Origin("environ", None, None, "false"),
+        "workers": Origin("defaults", None, None, "4"),
+    }
+    assert provenance.explain(config.db)["port"].source == "default"
+
+
+def test_provenance_of_environ():
+    with record_provenance() as provenance:
+        config = AppConfig.from_environ(environ={"TRACED_DB_HOST": "db"})
+    assert provenance.explain(config)["db.host"] == Origin("mapping", None, None, "db")
+
+
+def test_provenance_is_not_recorded_by_default():
+    config = AppConfig.from_environ(environ={"TRACED_DB_HOST": "db"})
+    with record_provenance() as provenance:
+        pass
+    with pytest.raises(LookupError):
+        provenance.explain(config)
+
+
+def test_provenance_keeps_compact_configs_interned():
+    @configclass(frozen=True, compact=True)
+    class Shared:
+        host: str
+
+    @configclass(frozen=True, compact=True)
+    class Tenant:
+        name: str
+        db: Shared
+
+    with record_provenance() as provenance:
+        first = Tenant.from_environ(environ={"NAME": "a", "DB_HOST": "db"})
+        second = Tenant.from_environ(environ={"NAME": "b", "DB_HOST": "db"})
+
+    assert first.db is second.db
+    assert provenance.explain(second)["db.host"].raw == "db"
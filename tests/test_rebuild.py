@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from configclasses import configclass, rebuild
+from configclasses.exceptions import ValidationError
+from configclasses.secret import Secret
+
+
+@configclass
+class DB:
+    host: str
+    port: int = 5432
+    password: Optional[Secret] = None
+
+
+@configclass
+class Cache:
+    hosts: List[str]
+    ttl: int = 60
+
+
+@configclass
+class Features:
+    flags: Dict[str, bool]
+
+
+@configclass(prefix="REBUILT")
+class AppConfig:
+    name: str
+    db: DB
+    cache: Cache
+    features: Features
+
+
+ENVIRON = {
+    "REBUILT_NAME": "app",
+    "REBUILT_DB_HOST": "db",
+    "REBUILT_DB_PORT": "5433",
+    "REBUILT_CACHE_HOSTS_0": "cache-0",
+    "REBUILT_CACHE_HOSTS_1": "cache-1",
+    "REBUILT_FEATURES_FLAGS_SEARCH": "true",
+}
+
+
+@pytest.fixture
+def config():
+    return AppConfig.from_environ(environ=ENVIRON)
+
+
+def test_rebuild_changed_leaf(config):
+    environ = {**ENVIRON, "REBUILT_DB_PORT": "6543"}
+    new = rebuild(config, ["REBUILT_DB_PORT"], environ=environ)
+
+    assert new == AppConfig.from_environ(environ=environ)
+    assert new.db.port == 6543
+    assert new.cache is config.cache
+    assert new.features is config.features
+    assert config.db.port == 5433
+
+
+def test_rebuild_is_case_insensitive(config):
+    environ = {**ENVIRON, "REBUILT_NAME": "renamed"}
+    new = rebuild(config, ["rebuilt_name"], environ=environ)
+    assert new.name == "renamed"
+    assert new.db is config.db
+
+
+def test_rebuild_without_changes_returns_instance(config):
+    assert rebuild(config, ["UNRELATED_KEY"], environ=ENVIRON) is config
+    # Listed as changed, but still the same value.
+    assert rebuild(config, ["REBUILT_DB_HOST"], environ=ENVIRON) is config
+
+
+def test_rebuild_removed_key_falls_back_to_default(config):
+    environ = {key: value for key, value in ENVIRON.items() if key != "REBUILT_DB_PORT"}
+    new = rebuild(config, ["REBUILT_DB_PORT"], environ=environ)
+    assert new.db.port == 5432
+
+
+@pytest.mark.parametrize(
+    "changed, attribute",
+    [
+        ({"REBUILT_CACHE_HOSTS_2": "cache-2"}, "cache"),
+        ({"REBUILT_FEATURES_FLAGS_BETA": "false"}, "features"),
+        ({"REBUILT_DB_PASSWORD_FILE": "/run/secrets/db"}, "db"),
+    ],
+)
+def test_rebuild_collected_fields(config, changed, attribute):
+    environ = {**ENVIRON, **changed}
+    new = rebuild(config, changed, environ=environ)
+    assert new == AppConfig.from_environ(environ=environ)
+    for other in {"db", "cache", "features"} - {attribute}:
+        assert getattr(new, other) is getattr(config, other)
+    assert getattr(new, attribute) is not getattr(config, attribute)
+
+
+def test_rebuild_reports_every_error(config):
+    environ = {**ENVIRON, "REBUILT_DB_PORT": "x", "REBUILT_CACHE_TTL": "y"}
+    with pytest.raises(ValidationError) as error:
+        rebuild(config, ["REBUILT_DB_PORT", "REBUILT_CACHE_TTL"], environ=environ)
+    assert [e.key for e in error.value.errors] == [
+        "rebuilt_db_port",
+        "rebuilt_cache_ttl",
+    ]
+
+
+def test_rebuild_with_prefix():
+    environ = {
+        "TENANT_NAME": "tenant",
+        "TENANT_DB_HOST": "db",
+        "TENANT_CACHE_HOSTS_0": "cache",
+    }
+    config = AppConfig.from_environ(environ=environ, prefix="TENANT")
+    environ = {**environ, "TENANT_DB_HOST": "moved"}
+    new = rebuild(config, ["TENANT_DB_HOST"], environ=environ, prefix="TENANT")
+    assert new.db.host == "moved"
+    assert new.cache is config.cache
@@ -0,0 +1,94 @@
+import copy
+import pickle
+from dataclasses import asdict
+from typing import Optional
+
+import pytest
+
+from configclasses import configclass
+from configclasses.configclasses import dump
+from configclasses.secret import (
+    DirectoryVault,
+    Secret,
+    _resolvers,
+    register_secret_resolver,
+)
+
+
+@configclass
+class DB:
+    host: str
+    password: Secret
+    token: Optional[Secret] = None
+
+
+@configclass(prefix="SECRETS")
+class AppConfig:
+    db: DB
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / "db").mkdir()
+    (tmp_path / "db" / "token").write_text("t0k3n\n")
+    resolver = register_secret_resolver("vault", DirectoryVault(tmp_path))
+    yield resolver
+    del _resolvers["vault"]
+
+
+def test_secret_from_value():
+    config = AppConfig.from_environ(
+        environ={"SECRETS_DB_HOST": "db", "SECRETS_DB_PASSWORD": "hunter2"}
+    )
+    assert config.db.password.get() == "hunter2"
+    assert config.db.token is None
+    assert "hunter2" not in repr(config)
+
+
+def test_secret_file_is_read_on_first_access(tmp_path):
+    secret_file = tmp_path / "password"
+    secret_file.write_text("hunter2\n")
+    config = AppConfig.from_environ(
+        environ={"SECRETS_DB_HOST": "db", "SECRETS_DB_PASSWORD_FILE": str(secret_file)}
+    )
+    assert not config.db.password.resolved
+
+    assert config.db.password.get() == "hunter2"
+    secret_file.write_text("changed")
+    assert config.db.password.get() == "hunter2"
+
+
+def test_secret_from_custom_resolver(vault):
+    config = AppConfig.from_environ(
+        environ={
+            "SECRETS_DB_HOST": "db",
+            "SECRETS_DB_PASSWORD": "hunter2",
+            "SECRETS_DB_TOKEN_VAULT": "db/token",
+        }
+    )
+    assert config.db.token.get() == "t0k3n"
+
+    with pytest.raises(ValueError):
+        vault("../outside")
+
+
+def test_secrets_are_not_dumped():
+    config = AppConfig(DB("db", Secret("hunter2")))
+    assert dump(config, extension=".env") == b"db_host=db\n"
+
+
+def test_configs_with_secrets_can_be_copied_and_pickled(tmp_path):
+    secret_file = tmp_path / "password"
+    secret_file.write_text("hunter2\n")
+    config = AppConfig.from_environ(
+        environ={"SECRETS_DB_HOST": "db", "SECRETS_DB_PASSWORD_FILE": str(secret_file)}
+    )
+
+    for clone in (copy.deepcopy(config), pickle.loads(pickle.dumps(config))):
+        assert clone == config
+        assert not clone.db.password.resolved
+        assert clone.db.password.get() == "hunter2"
+    assert asdict(config)["db"]["password"] == config.db.password
+
+    config.db.password.get()
+    assert pickle.loads(pickle.dumps(config)).db.password.resolved
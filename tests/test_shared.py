@@ -0,0 +1,117 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from configclasses import configclass
+from configclasses.exceptions import ValidationError
+from configclasses.shared import SharedConfigPublisher, SharedConfigReader
+
+
+@configclass
+class DB:
+    host: str
+    port: int = 5432
+
+
+@configclass(prefix="SHARED")
+class AppConfig:
+    name: str
+    db: DB
+
+
+reader = None
+
+
+def attach(name):
+    global reader
+    reader = SharedConfigReader(name)
+
+
+def load_in_worker(_=None):
+    config = reader.load(AppConfig)
+    return reader.version, config
+
+
+@pytest.fixture
+def publisher():
+    with SharedConfigPublisher() as publisher:
+        yield publisher
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / "app.toml").write_text(
+        'shared_name = "app"\n[shared_db]\nhost = "db"\nport = 5433\n'
+    )
+    return tmp_path
+
+
+def test_publish_and_read(publisher):
+    with SharedConfigReader(publisher.name) as shared:
+        assert shared.version == 0
+        assert shared.values() == {}
+
+        assert (
+            publisher.publish({"SHARED_NAME": "app", "SHARED_DB_HOST": "ünïcode"}) == 1
+        )
+        assert shared.version == 1
+        config = shared.load(AppConfig)
+        assert config == AppConfig(name="app", db=DB(host="ünïcode"))
+
+        values = shared.values()
+        assert shared.values() is values  # only copied once per version
+        publisher.publish({"SHARED_NAME": "reloaded", "SHARED_DB_HOST": "db"})
+        assert shared.version == 2
+        assert shared.load(AppConfig).name == "reloaded"
+
+
+def test_upper_case_env_vars_beat_lower_case_published_keys(publisher, monkeypatch):
+    monkeypatch.setenv("SHARED_DB_PORT", "1")
+    values = {"SHARED_NAME": "app", "SHARED_DB_HOST": "db"}
+    with SharedConfigReader(publisher.name) as shared:
+        publisher.publish({**values, "shared_db_port": "2"})
+        assert shared.load(AppConfig).db.port == 1
+        publisher.publish({**values, "SHARED_DB_PORT": "3"})
+        assert shared.load(AppConfig).db.port == 3
+
+
+def test_publish_path_checks_values(publisher, config_dir):
+    assert publisher.publish_path(config_dir, AppConfig) == 1
+    (config_dir / "app.toml").write_text(
+        'shared_name = "app"\n[shared_db]\nport = "x"\n'
+    )
+    with pytest.raises(ValidationError):
+        publisher.publish_path(config_dir, AppConfig)
+    assert publisher.version == 1
+
+
+def test_reader_of_unknown_segment():
+    with pytest.raises(FileNotFoundError):
+        SharedConfigReader("cc-does-not-exist")
+
+
+@pytest.mark.parametrize(
+    "start_method",
+    [
+        method
+        for method in ("fork", "spawn")
+        if method in multiprocessing.get_all_start_methods()
+    ],
+)
+def test_workers_load_published_config(publisher, config_dir, start_method):
+    publisher.publish_path(config_dir, AppConfig)
+    expected = AppConfig(name="app", db=DB(host="db", port=5433))
+    context = multiprocessing.get_context(start_method)
+
+    with ProcessPoolExecutor(
+        2, mp_context=context, initializer=attach, initargs=(publisher.name,)
+    ) as pool:
+        assert list(pool.map(load_in_worker, range(4))) == [(1, expected)] * 4
+        publisher.publish({"SHARED_NAME": "reloaded", "SHARED_DB_HOST": "db"})
+        versions = {version for version, _ in pool.map(load_in_worker, range(4))}
+        assert versions == {2}
+
+    # Workers exiting must not have removed the segments they attached to.
+    with SharedConfigReader(publisher.name) as shared:
+        assert shared.load(AppConfig).name == "reloaded"
@@ -0,0 +1,141 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from configclasses import configclass
+from configclasses.__main__ import main
+from configclasses.exceptions import InvalidSnapshot
+from configclasses.snapshot import compile_snapshot, is_stale, read_snapshot
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+@configclass
+class DB:
+    host: str
+    port: int = 5432
+
+
+@configclass(prefix="SNAP")
+class AppConfig:
+    name: str
+    db: DB
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    directory = tmp_path / "config"
+    directory.mkdir()
+    (directory / "base.toml").write_text(
+        'snap_name = "app"\n[snap_db]\nhost = "base"\nport = 5433\n'
+    )
+    (directory / "override.yaml").write_text("snap_db:\n  host: ünïcode\n")
+    return directory
+
+
+def test_snapshot_loads_same_config(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    assert compile_snapshot(config_dir, snapshot) is True
+    assert compile_snapshot(config_dir, snapshot) is False
+
+    expected = AppConfig.from_path(str(config_dir))
+    assert AppConfig.from_snapshot(str(snapshot)) == expected
+    assert expected == AppConfig(name="app", db=DB(host="ünïcode", port=5433))
+
+
+def test_snapshot_of_a_file(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    compile_snapshot(config_dir / "base.toml", snapshot)
+    assert AppConfig.from_snapshot(str(snapshot)).db == DB(host="base", port=5433)
+
+
+def test_stale_snapshot_falls_back_to_files(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    compile_snapshot(config_dir, snapshot)
+    (config_dir / "override.yaml").write_text("snap_db:\n  host: changed\n")
+
+    assert is_stale(read_snapshot(snapshot))
+    assert AppConfig.from_snapshot(str(snapshot)).db.host == "changed"
+    assert AppConfig.from_snapshot(str(snapshot), verify=False).db.host == "ünïcode"
+
+
+def test_added_file_makes_snapshot_stale(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    compile_snapshot(config_dir, snapshot)
+    (config_dir / "extra.env").write_text("SNAP_NAME=extra\n")
+    assert is_stale(read_snapshot(snapshot))
+    assert AppConfig.from_snapshot(str(snapshot)).name == "extra"
+
+
+def test_snapshot_without_its_sources(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    compile_snapshot(config_dir, snapshot)
+    for file in config_dir.iterdir():
+        file.unlink()
+    config_dir.rmdir()
+    assert AppConfig.from_snapshot(str(snapshot)).db.host == "ünïcode"
+
+
+@pytest.mark.parametrize("content", [b"", b"not a snapshot at all, just text" * 3])
+def test_invalid_snapshot(tmp_path, content):
+    snapshot = tmp_path / "config.snapshot"
+    snapshot.write_bytes(content)
+    with pytest.raises(InvalidSnapshot):
+        AppConfig.from_snapshot(str(snapshot))
+
+
+def test_truncated_snapshot(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    compile_snapshot(config_dir, snapshot)
+    snapshot.write_bytes(snapshot.read_bytes()[:-3])
+    with pytest.raises(InvalidSnapshot):
+        read_snapshot(snapshot)
+
+
+def test_compile_command(config_dir, tmp_path, capsys):
+    snapshot = tmp_path / "config.snapshot"
+    assert main(["compile", str(config_dir), "-o", str(snapshot)]) == 0
+    assert "Wrote" in capsys.readouterr().out
+    assert AppConfig.from_snapshot(str(snapshot)).name == "app"
+
+    assert main(["compile", str(tmp_path / "missing"), "-o", str(snapshot)]) == 1
+    assert "does not exist" in capsys.readouterr().err
+
+    unsupported = tmp_path / "config.xml"
+    unsupported.write_text("<config/>")
+    assert main(["compile", str(unsupported), "-o", str(snapshot)]) == 1
+    assert "xml" in capsys.readouterr().err
+
+
+def test_compile_command_path_options(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    main(["compile", str(config_dir), "-o", str(snapshot), "--exclude", "*.yaml"])
+    assert AppConfig.from_snapshot(str(snapshot), exclude=["*.yaml"]).db.host == "base"
+
+
+def test_from_snapshot_imports_no_parser(config_dir, tmp_path):
+    snapshot = tmp_path / "config.snapshot"
+    subprocess.run(
+        [sys.executable, "-m", "configclasses", "compile", str(config_dir)]
+        + ["-o", str(snapshot)],
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+    )
+    code = (
+        "import sys\n"
+        "from tests.test_snapshot import AppConfig\n"
+        f"config = AppConfig.from_snapshot({str(snapshot)!r})\n"
+        "assert config.db.host == 'ünïcode', config\n"
+        "print(sorted({'tomlkit', 'yaml', 'dotenv', 'configparser'} & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,97 @@
+from dataclasses import field
+from typing import Annotated, List
+
+import pytest
+
+from configclasses import configclass
+from configclasses.exceptions import ConversionError, ValidationError
+from configclasses.validators import (
+    Ge,
+    Le,
+    MaxLen,
+    OneOf,
+    Port,
+    Predicate,
+    Regex,
+    Url,
+    Validator,
+)
+
+
+@configclass
+class DB:
+    url: str = field(metadata={"validators": [Url(schemes=["postgresql"])]})
+    port: int = field(default=5432, metadata={"validators": [Port()]})
+
+
+@configclass(prefix="CHECKED")
+class AppConfig:
+    db: DB
+    workers: Annotated[int, Ge(1), Le(64)] = 4
+    log_level: Annotated[str, OneOf("debug", "info", "error")] = "info"
+    name: Annotated[str, Regex(r"[a-z][a-z0-9-]*")] = "app"
+    hosts: Annotated[List[str], MaxLen(2)] = field(default_factory=list)
+
+
+def test_valid_values():
+    config = AppConfig.from_environ(
+        environ={
+            "CHECKED_DB_URL": "postgresql://db/app",
+            "CHECKED_WORKERS": "64",
+            "CHECKED_HOSTS": "a,b",
+        }
+    )
+    assert config == AppConfig(DB("postgresql://db/app"), 64, hosts=["a", "b"])
+
+
+def test_every_invalid_value_is_reported():
+    with pytest.raises(ValidationError) as error:
+        AppConfig.from_environ(
+            environ={
+                "CHECKED_DB_URL": "mysql://db/app",
+                "CHECKED_DB_PORT": "70000",
+                "CHECKED_WORKERS": "0",
+                "CHECKED_LOG_LEVEL": "loud",
+                "CHECKED_NAME": "My App",
+                "CHECKED_HOSTS": "a,b,c",
+            }
+        )
+    assert [error.key for error in error.value.errors] == [
+        "checked_db_url",
+        "checked_db_port",
+        "checked_workers",
+        "checked_log_level",
+        "checked_name",
+        "checked_hosts",
+    ]
+    assert "checked_workers" in str(error.value)
+    assert "must be >= 1" in str(error.value)
+
+
+def test_conversion_and_validation_errors_are_collected_together():
+    @configclass(prefix="CHECKED")
+    class Limits:
+        workers: Annotated[int, Predicate(lambda value: value % 2 == 0, "must be even")]
+        timeout: float
+
+    with pytest.raises(ConversionError) as error:
+        Limits.from_environ(environ={"CHECKED_WORKERS": "3", "CHECKED_TIMEOUT": "x"})
+    assert isinstance(error.value, ValidationError)
+    assert [str(error.error) for error in error.value.errors][0] == "must be even"
+    assert len(error.value.errors) == 2
+
+
+def test_defaults_are_not_validated():
+    @configclass
+    class Config:
+        port: Annotated[int, Port()] = 0
+
+    assert Config.from_environ(environ={}).port == 0
+
+
+def test_validators_must_implement_compile():
+    class Incomplete(Validator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
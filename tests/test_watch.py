@@ -0,0 +1,104 @@
+import os
+import threading
+
+from configclasses import configclass
+from configclasses.watch import ConfigHolder, files_signature
+
+
+@configclass(frozen=True)
+class ClientConfig:
+    host: str
+    port: int
+
+
+def touch(path, text):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_files_signature_walks_directories(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.env").write_text("A=1")
+    (tmp_path / "sub" / "b.env").write_text("B=22")
+    signature = files_signature(tmp_path)
+    assert sorted(size for _, size in signature.values()) == [3, 4]
+
+
+def test_holder_swap_calls_subscribers():
+    holder = ConfigHolder("old")
+    changes = []
+    holder.subscribe(lambda old, new: changes.append((old, new)))
+    holder.swap("new")
+    assert holder.current == "new"
+    assert changes == [("old", "new")]
+
+
+def test_holder_swap_survives_failing_subscribers():
+    holder = ConfigHolder("old")
+    changes = []
+
+    @holder.subscribe
+    def fail(old, new):
+        raise RuntimeError("broken subscriber")
+
+    holder.subscribe(lambda old, new: changes.append(new))
+    holder.swap("new")
+    assert holder.current == "new"
+    assert changes == ["new"]
+    assert str(holder.last_error) == "broken subscriber"
+
+
+def test_watch_keeps_running_after_failing_subscriber(tmp_path):
+    config_file = tmp_path / "client.env"
+    config_file.write_text("HOST=localhost\nPORT=8000")
+    reloaded = threading.Event()
+
+    def fail(old, new):
+        reloaded.set()
+        raise RuntimeError("broken subscriber")
+
+    with ClientConfig.watch(
+        config_file, interval=0.01, debounce=0.02, on_change=fail
+    ) as holder:
+        touch(config_file, "HOST=localhost\nPORT=9000")
+        assert reloaded.wait(5)
+        reloaded.clear()
+        touch(config_file, "HOST=localhost\nPORT=9001")
+        assert reloaded.wait(5)
+
+    assert holder.current.port == 9001
+    assert isinstance(holder.last_error, RuntimeError)
+
+
+def test_watch_reloads_on_change(tmp_path):
+    config_file = tmp_path / "client.env"
+    config_file.write_text("HOST=localhost\nPORT=8000")
+    reloaded = threading.Event()
+
+    with ClientConfig.watch(
+        config_file, interval=0.01, debounce=0.02, on_change=lambda *_: reloaded.set()
+    ) as holder:
+        first = holder.current
+        assert first.port == 8000
+        touch(config_file, "HOST=localhost\nPORT=9000")
+        assert reloaded.wait(5)
+
+    assert holder.current.port == 9000
+    assert first.port == 8000
+
+
+def test_watch_keeps_instance_on_errors(tmp_path):
+    config_file = tmp_path / "client.env"
+    config_file.write_text("HOST=localhost\nPORT=8000")
+
+    with ClientConfig.watch(config_file, interval=0.01, debounce=0.02) as holder:
+        first = holder.current
+        touch(config_file, "HOST=localhost\nPORT=not-a-port")
+        for _ in range(500):
+            if holder.last_error is not None:
+                break
+            threading.Event().wait(0.01)
+
+    assert isinstance(holder.last_error, ValueError)
+    assert holder.current is first